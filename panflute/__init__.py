@@ -6,6 +6,8 @@ Panflute is a Python package that makes `Pandoc <http://pandoc.org/>`_
 filters fun to write. (`Installation <install.html>`_)
 """
 
+import sys
+
 from .containers import ListContainer, DictContainer
 
 from .base import Element, Block, Inline, MetaValue
@@ -25,11 +27,21 @@ from .elements import (
 from .elements import (
     MetaList, MetaMap, MetaString, MetaBool, MetaInlines, MetaBlocks)
 
-from .io import load, dump, run_filter, run_filters
+from .io import load, dump, run_filter, run_filters, element_types
 from .io import toJSONFilter, toJSONFilters  # Wrappers
 
+from .backends import (
+    get_json_backend, set_json_backend, available_json_backends)
+
 from .tools import (
-    stringify, yaml_filter, shell, run_pandoc, convert_text, debug)
+    stringify, yaml_filter, shell, run_pandoc, convert_text,
+    convert_text_many, debug, get_pandoc_pool, set_pandoc_pool,
+    get_pandoc_info, get_convert_cache, set_convert_cache)
+
+# The asynchronous API needs Python 3.5+ (async def)
+if sys.version_info >= (3, 5):
+    from .aio import (
+        run_filters_async, shell_async, run_pandoc_async, convert_text_async)
 
 from .autofilter import main
 
@@ -0,0 +1,231 @@
+"""
+Asynchronous versions of the functions that rely on external calls, so
+the slow parts of a filter can run at the same time (see
+:func:`run_filters_async`)
+
+This module needs Python 3.5 or later, so its functions are only
+exported by the ``panflute`` package on those versions.
+"""
+
+# ---------------------------
+# Imports
+# ---------------------------
+
+from .containers import ListContainer, DictContainer
+from .io import load, dump, run_filters
+from .tools import (get_pandoc_info, get_convert_cache, _convert_text_args,
+                    _pandoc_args, _pandoc_output, _convert_text_result)
+
+import os
+import shlex
+import asyncio
+import inspect
+from subprocess import PIPE
+
+
+# ---------------------------
+# Functions
+# ---------------------------
+
+async def run_filters_async(actions,
+                            prepare=None, finalize=None,
+                            input_stream=None, output_stream=None,
+                            doc=None,
+                            fused=False,
+                            limit=8,
+                            **kwargs):
+    """
+    Like :func:`.run_filters`, but the *actions* can also return
+    awaitables (such as the coroutines of :func:`.shell_async` and
+    :func:`.convert_text_async`, or of ``async def`` functions),
+    so the slow parts of many elements run at the same time:
+
+        >>> @element_types(CodeBlock)
+        >>> async def action(elem, doc):
+        >>>     if 'dot' in elem.classes:
+        >>>         svg = await shell_async(['dot', '-Tsvg'], elem.text.encode())
+        >>>         return RawBlock(svg.decode(), format='html')
+        >>>
+        >>> def main(doc=None):
+        >>>     return asyncio.run(run_filters_async([action], doc=doc))
+
+    The document is walked first, collecting the awaitables; then up
+    to *limit* of them are awaited at the same time, and their results
+    replace the elements as if the actions had returned them (``None``
+    keeps the element, ``[]`` deletes it). These results are not walked
+    by the other actions.
+
+    An ``async def`` action returns a coroutine for every element it is
+    called on, and each one is scheduled and awaited, so declare the
+    types it needs with :func:`.element_types` (as above), or use a
+    regular function that only returns an awaitable when needed.
+    Only one action can return an awaitable for each element; if
+    another one does, a :class:`ValueError` is raised.
+
+    :param limit: maximum number of awaitables run at the same time
+    :type limit: :class:`int`
+
+    See :func:`.run_filters` for the other arguments.
+    """
+
+    load_and_dump = (doc is None)
+
+    if load_and_dump:
+        doc = load(input_stream=input_stream)
+
+    pending = {}  # id(element) -> (element, awaitable)
+    actions = [_collect_awaitables(action, pending) for action in actions]
+    try:
+        doc = run_filters(actions, prepare=prepare, doc=doc,
+                          fused=fused, **kwargs)
+    except BaseException:
+        for _, awaitable in pending.values():
+            _close(awaitable)
+        raise
+
+    semaphore = asyncio.Semaphore(limit)
+
+    async def limited(awaitable):
+        async with semaphore:
+            return await awaitable
+
+    pending = list(pending.values())
+    results = await asyncio.gather(*(limited(awaitable)
+                                     for _, awaitable in pending))
+    for (elem, _), altered in zip(pending, results):
+        if elem is doc and altered is not None and altered != []:
+            doc = altered
+        else:
+            _splice(elem, altered)
+
+    if finalize is not None:
+        finalize(doc)
+
+    if load_and_dump:
+        dump(doc, output_stream=output_stream)
+    else:
+        return(doc)
+
+
+def _collect_awaitables(action, pending):
+    """
+    Return a copy of ``action`` (keeping its ``types`` attribute) that
+    adds the awaitables it returns to ``pending`` (keyed on the id of
+    their element), leaving the elements unchanged for now
+    """
+    def collecting(elem, doc, **kwargs):
+        altered = action(elem, doc, **kwargs)
+        if inspect.isawaitable(altered):
+            if id(elem) in pending:
+                _close(altered)
+                msg = 'more than one action returned an awaitable for ' \
+                      'the same {} element'.format(elem.tag)
+                raise ValueError(msg)
+            pending[id(elem)] = elem, altered
+            return None
+        return altered
+
+    if hasattr(action, 'types'):
+        collecting.types = action.types
+    return collecting
+
+
+def _close(awaitable):
+    """
+    Close an awaitable that won't be awaited (so coroutines don't warn
+    that they were never awaited)
+    """
+    if inspect.iscoroutine(awaitable):
+        awaitable.close()
+    elif isinstance(awaitable, asyncio.Future):
+        awaitable.cancel()
+
+
+def _splice(elem, altered):
+    """
+    Put ``altered`` (an element, a list of elements, ``[]`` or ``None``)
+    in the place of ``elem``, once the document has been walked
+    """
+    if altered is None or altered is elem or elem.parent is None:
+        return  # Unchanged, or no longer in the document
+
+    container = elem.container
+    if isinstance(container, ListContainer):
+        for i, item in enumerate(container.list):
+            if item is elem:
+                break
+        else:
+            return
+        del container[i]
+        for j, item in enumerate(
+                altered if isinstance(altered, list) else [altered]):
+            container.insert(i + j, item)
+    elif isinstance(container, DictContainer):
+        for key, value in list(container.items()):
+            if value is elem:
+                if altered == []:
+                    del container[key]
+                else:
+                    container[key] = altered
+    elif altered != []:
+        setattr(elem.parent, elem.location, altered)
+
+
+async def shell_async(args, msg=None):
+    """
+    Like :func:`.shell` (with ``wait=True``), but returns a coroutine so
+    many commands can run at the same time, e.g. with
+    :func:`.run_filters_async` or :func:`asyncio.gather`.
+    """
+
+    # Fix Windows error if passed a string
+    if isinstance(args, str):
+        args = shlex.split(args, posix=(os.name != "nt"))
+        args = [arg.replace('/', '\\') for arg in args]
+
+    proc = await asyncio.create_subprocess_exec(
+        *args, stdin=PIPE, stdout=PIPE, stderr=PIPE)
+    out, err = await proc.communicate(input=msg)
+    if proc.returncode != 0:
+        raise IOError(err)
+    return out
+
+
+async def run_pandoc_async(text='', args=None):
+    """
+    Like :func:`.run_pandoc`, but returns a coroutine
+    """
+    if args is None:
+        args = []
+
+    pandoc_path = get_pandoc_info().path
+    out = await shell_async([pandoc_path] + args, text.encode('utf-8'))
+    return out.decode('utf-8')
+
+
+async def convert_text_async(text,
+                             input_format='markdown',
+                             output_format='panflute',
+                             standalone=False,
+                             extra_args=None):
+    """
+    Like :func:`.convert_text`, but returns a coroutine
+    (results are also cached, see :func:`.set_convert_cache`)
+    """
+
+    text, in_fmt, out_fmt, extra_args = _convert_text_args(
+        text, input_format, output_format, standalone, extra_args)
+
+    cache = get_convert_cache()
+    out = key = None
+    if cache is not None:
+        key = cache.key(text, in_fmt, out_fmt, extra_args)
+        out = cache.get(key)
+
+    if out is None:
+        args = _pandoc_args(in_fmt, out_fmt, extra_args)
+        out = _pandoc_output(await run_pandoc_async(text, args))
+        if key is not None:
+            cache.put(key, out)
+
+    return _convert_text_result(out, output_format, standalone)
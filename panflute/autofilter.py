@@ -8,13 +8,19 @@ import sys
 from collections import OrderedDict
 
 from .io import load, dump
-from .tools import debug, run_pandoc
+from .tools import debug, get_pandoc_info
+from .profiler import get_profiler, set_active_profiler, timed
 
 
 def main():
-    doc = load()
+    doc, load_seconds = timed(load)
     meta = doc.metadata
 
+    # Report the time spent in each filter (see panflute.profiler)
+    profiler = get_profiler(doc)
+    if profiler is not None:
+        profiler.seconds['load'] = load_seconds
+
     verbose = doc.get_metadata('panflute-verbose', False)
 
     # extra_path can be a list, a string, or missing
@@ -38,20 +44,20 @@ def main():
         if verbose:
             msg = "panflute: will run the following filters:"
             debug(msg, ' '.join(filters))
-        doc = autorun_filters(filters, doc, extra_path, verbose)
+        doc = autorun_filters(filters, doc, extra_path, verbose, profiler)
     elif verbose:
         debug("panflute: no filters found in metadata")
 
-    dump(doc)
+    dump_seconds = timed(dump, doc)[1]
+    if profiler is not None:
+        profiler.seconds['dump'] = dump_seconds
+        profiler.write()
 
 
-def autorun_filters(filters, doc, searchpath, verbose):
+def autorun_filters(filters, doc, searchpath, verbose, profiler=None):
     # Extract $DATADIR
-    info = run_pandoc(args=['--version']).splitlines()
-    prefix = "Default user data directory: "
-    info = [row for row in info if row.startswith(prefix)]
-    assert len(info) == 1
-    datadir = info[0][len(prefix):]
+    datadir = get_pandoc_info().data_dir
+    assert datadir is not None
     filterdir = os.path.join(datadir, 'filters')
 
     searchpath = searchpath + ['.', filterdir] + sys.path
@@ -80,13 +86,20 @@ def autorun_filters(filters, doc, searchpath, verbose):
         _ = dict()
         if verbose:
             debug("panflute: running filter <{}>".format(ff))
+        stats = None if profiler is None else profiler.start_filter(ff)
         with open(fn) as fp:
-            exec(fp.read(), _)
+            exec_seconds = timed(exec, fp.read(), _)[1]
+            set_active_profiler(profiler)
             try:
-                doc = _['main'](doc)
+                doc, run_seconds = timed(_['main'], doc)
             except:
                 debug("Failed to run filter: " + ff)
                 raise
+            finally:
+                set_active_profiler(None)
+        if stats is not None:
+            stats['exec_seconds'] = exec_seconds
+            stats['run_seconds'] = run_seconds
         if verbose:
             debug("panflute: filter <{}> completed".format(ff))
 
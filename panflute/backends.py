@@ -0,0 +1,240 @@
+"""
+JSON backends used by :func:`.load`, :func:`.dump` and :func:`.convert_text`
+
+The fastest installed library is selected when panflute is imported
+(`orjson <https://github.com/ijl/orjson>`_, then
+`ujson <https://github.com/ultrajson/ultrajson>`_, and then the
+standard library ``json`` module as fallback).
+Use :func:`set_json_backend` to choose a different one.
+
+These libraries are only used for encoding. To decode, the built-in
+backends all use the standard library parser, which builds each element
+as it parses: building the elements takes longer than parsing, so this is
+faster than building them in a second pass after a faster parser.
+
+All backends produce the same compact output as Pandoc (without escaping
+non-ASCII characters), except for floats with exponents (e.g. ``1e-05`` vs
+``0.00001``), which Pandoc reads in either form. Values that a fast backend
+can't handle (e.g. integers above 64 bits) fall back to the standard library.
+"""
+
+# ---------------------------
+# Imports
+# ---------------------------
+
+import json
+from functools import partial
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+
+# ---------------------------
+# Backend Classes
+# ---------------------------
+
+class JSONBackend(object):
+    """
+    Base class of all JSON backends.
+
+    Subclasses only need to implement :meth:`loads` and :meth:`dumps`;
+    decoding into elements is then done in two phases: first the JSON text
+    is parsed into plain lists and dicts, and then these are converted
+    into elements from the bottom up.
+    """
+
+    name = None
+
+    def loads(self, text):
+        """
+        Parse JSON text into plain Python lists and dicts.
+        """
+        raise NotImplementedError
+
+    def dumps(self, obj):
+        """
+        Encode plain Python objects (such as those returned by
+        :meth:`.Element.to_json`) into compact JSON text.
+        """
+        raise NotImplementedError
+
+    def decode(self, text, hook):
+        """
+        Parse JSON text, calling ``hook`` for every JSON object
+        (with a list of key-value pairs, as in the ``object_pairs_hook``
+        argument of :func:`json.loads`).
+        """
+        return build(self.loads(text), hook)
+
+    def __repr__(self):
+        return '{}()'.format(type(self).__name__)
+
+
+class StdlibBackend(JSONBackend):
+    """
+    Backend based on the standard library ``json`` module
+    """
+
+    name = 'json'
+
+    _dumps = partial(
+        json.dumps,
+        check_circular=False,
+        separators=(',', ':'),  # Compact separators, like Pandoc
+        ensure_ascii=False  # For Pandoc compat
+    )
+
+    def loads(self, text):
+        return json.loads(text)
+
+    def dumps(self, obj):
+        return self._dumps(obj)
+
+    def decode(self, text, hook):
+        # The parser already calls back into Python for each object,
+        # so both phases can be done in a single pass (this is also used
+        # by the subclasses, as it is faster than their two phases)
+        return json.loads(text, object_pairs_hook=hook)
+
+
+class OrjsonBackend(StdlibBackend):
+    """
+    Backend based on the ``orjson`` package
+    """
+
+    name = 'orjson'
+
+    def loads(self, text):
+        try:
+            return orjson.loads(text)
+        except orjson.JSONDecodeError:
+            return super(OrjsonBackend, self).loads(text)
+
+    def dumps(self, obj):
+        try:
+            return orjson.dumps(obj).decode('utf-8')
+        except orjson.JSONEncodeError:
+            return super(OrjsonBackend, self).dumps(obj)
+
+
+class UjsonBackend(StdlibBackend):
+    """
+    Backend based on the ``ujson`` package
+    """
+
+    name = 'ujson'
+
+    def loads(self, text):
+        try:
+            return ujson.loads(text)
+        except (ValueError, OverflowError):
+            return super(UjsonBackend, self).loads(text)
+
+    def dumps(self, obj):
+        try:
+            return ujson.dumps(obj, ensure_ascii=False,
+                               escape_forward_slashes=False)
+        except (TypeError, OverflowError):
+            return super(UjsonBackend, self).dumps(obj)
+
+
+# ---------------------------
+# Functions
+# ---------------------------
+
+def build(obj, hook):
+    """
+    Second phase of :meth:`JSONBackend.decode`: convert the parsed JSON
+    objects with ``hook``, starting from the deepest ones.
+    """
+    cls = type(obj)
+    if cls != list and cls != dict:
+        return obj
+
+    # Explicit stack instead of recursion, so deeply nested documents don't
+    # reach the recursion limit. Each frame is [object, iterator over its
+    # items, converted items, key of the item being converted]
+    stack = [[obj, iter(obj.items()) if cls == dict else iter(obj), [], None]]
+    while True:
+        frame = stack[-1]
+        obj, items, ans = frame[0], frame[1], frame[2]
+        is_dict = type(obj) == dict
+        for item in items:
+            value = item[1] if is_dict else item
+            cls = type(value)
+            if cls == list or cls == dict:
+                if is_dict:
+                    frame[3] = item[0]
+                stack.append([value, iter(value.items()) if cls == dict
+                              else iter(value), [], None])
+                break
+            ans.append(item)
+        else:
+            stack.pop()
+            value = hook(ans) if is_dict else ans
+            if not stack:
+                return value
+            frame = stack[-1]
+            if type(frame[0]) == dict:
+                frame[2].append((frame[3], value))
+            else:
+                frame[2].append(value)
+
+
+def available_json_backends():
+    """
+    Return the names of the JSON backends that can be used,
+    from the fastest to the slowest (at encoding).
+
+    :rtype: :class:`list` of :class:`str`
+    """
+    names = [name for name, module in (('orjson', orjson), ('ujson', ujson))
+             if module is not None]
+    return names + ['json']
+
+
+def get_json_backend():
+    """
+    Return the JSON backend currently used by panflute.
+
+    :rtype: :class:`JSONBackend`
+    """
+    return _backend
+
+
+def set_json_backend(name=None):
+    """
+    Choose the JSON backend used by panflute.
+
+    :param name: either ``'orjson'``, ``'ujson'``, or ``'json'``
+        (the standard library), or an instance of a :class:`JSONBackend`
+        subclass. If None, the fastest available backend is selected.
+    :type name: :class:`str` | :class:`JSONBackend` | ``None``
+    :rtype: :class:`JSONBackend`
+    """
+    global _backend
+    if isinstance(name, JSONBackend):
+        _backend = name
+        return _backend
+
+    available = available_json_backends()
+    if name is None:
+        name = available[0]
+    elif name not in available:
+        raise ValueError('JSON backend not available: ' + repr(name) +
+                         ' (options are ' + ', '.join(available) + ')')
+    _backend = _backends[name]()
+    return _backend
+
+
+_backends = {cls.name: cls for cls in (StdlibBackend, OrjsonBackend,
+                                        UjsonBackend)}
+_backend = None
+set_json_backend()
@@ -9,8 +9,10 @@ Base classes and methods of all Pandoc elements
 # from operator import attrgetter
 from collections import OrderedDict
 from itertools import chain
+from operator import is_
 
-from .containers import ListContainer, DictContainer
+from .containers import ListContainer, DictContainer, attach
+from .containers import SharedListContainer
 from .utils import check_type, encode_dict, check_group
 from .constants import *
 
@@ -27,7 +29,7 @@ class Element(object):
     """
     Base class of all Pandoc elements
     """
-    __slots__ = ['parent', 'location', 'identifier', 'classes', 'attributes', '_content']
+    __slots__ = ['parent', 'location', 'identifier', '_content']
     _children = []
     child_type = None
 
@@ -37,6 +39,29 @@ class Element(object):
         self.location = location
         self._content = None
 
+    @classmethod
+    def _new(cls, content=None, oktypes=None, **kwargs):
+        """
+        Build an element from trusted data (such as pandoc's own JSON output)
+        without calling ``__init__``, so no type checks are run.
+
+        ``content`` must be a list (or None), and ``kwargs`` are set
+        directly as attributes of the element.
+        """
+        elem = cls.__new__(cls)
+        elem.parent = None
+        elem.location = None
+        elem.identifier = None
+        if content is None:
+            elem._content = None
+        else:
+            if oktypes is None:
+                oktypes = cls.child_type
+            elem._content = ListContainer._new(content, oktypes, elem)
+        for key, value in kwargs.items():
+            setattr(elem, key, value)
+        return elem
+
     @property
     def tag(self):
         tag = type(self).__name__
@@ -51,12 +76,18 @@ class Element(object):
         # This is just a convenience method
         # Override it for more complex elements
 
+        slots = _all_slots(type(self))
         extra = []
-        for key in self.__slots__:
-            if not key.startswith('_') and key != 'text':
-                val = getattr(self, key)
-                if val not in ([], OrderedDict(), ''):
-                    extra.append([key, val])
+        for key in slots:
+            # Read the classes and attributes from their slots, so they
+            # are not converted into a list and an OrderedDict
+            name = key[1:] if key in ('_classes', '_attributes') else key
+            if not name.startswith('_') and name not in ('text', 'parent', 'location'):
+                val = getattr(self, key, None)
+                if key == '_attributes' and type(val) is list:
+                    val = OrderedDict(val)  # Still as [key, value] pairs
+                if val not in ([], OrderedDict(), '', None):
+                    extra.append([name, val])
 
         if extra:
             extra = ('{}={}'.format(k, repr(v)) for k, v in extra)
@@ -64,10 +95,10 @@ class Element(object):
         else:
             extra = ''
 
-        if '_content' in self.__slots__:
+        if 'content' in self._children:
             content = ' '.join(repr(x) for x in self.content)
             return '{}({}{})'.format(self.tag, content, extra)
-        elif 'text' in self.__slots__:
+        elif 'text' in slots:
             return '{}({}{})'.format(self.tag, self.text, extra)
         else:
             return self.tag
@@ -83,13 +114,55 @@ class Element(object):
     # .identifier .classes .attributes
     # ---------------------------
 
+    # Most elements have no classes or attributes, so these are stored as
+    # None until they are accessed, and small attribute sets are kept as
+    # a list of [key, value] pairs (as encoded by pandoc) instead of an
+    # OrderedDict, until they are accessed
+
     def _set_ica(self, identifier, classes, attributes):
         self.identifier = check_type(identifier, str)
-        self.classes = [check_type(cl, str) for cl in classes]
-        self.attributes = OrderedDict(attributes)
+        self.classes = classes
+        self.attributes = attributes
 
     def _ica_to_json(self):
-        return [self.identifier, self.classes, list(self.attributes.items())]
+        attributes = self._attributes
+        if attributes is None:
+            attributes = []
+        elif type(attributes) is OrderedDict:
+            attributes = list(attributes.items())
+        return [self.identifier, self._classes or [], attributes]
+
+    @property
+    def classes(self):
+        """
+        List of class names of the element
+        """
+        classes = self._classes
+        if classes is None:
+            classes = []
+            self._classes = classes
+        return classes
+
+    @classes.setter
+    def classes(self, value):
+        self._classes = [check_type(cl, str) for cl in value] or None
+
+    @property
+    def attributes(self):
+        """
+        Ordered dict of the additional attributes of the element
+        """
+        attributes = self._attributes
+        if type(attributes) is not OrderedDict:
+            attributes = OrderedDict(attributes or ())
+            self._attributes = attributes
+        return attributes
+
+    @attributes.setter
+    def attributes(self, value):
+        if isinstance(value, dict):
+            value = value.items()
+        self._attributes = [list(item) for item in value] or None
 
     # ---------------------------
     # .content (setter and getter)
@@ -223,7 +296,7 @@ class Element(object):
             guess = guess.parent  # If no parent, this will be None
         return guess  # Returns either Doc or None
 
-    def walk(self, action, doc=None):
+    def walk(self, action, doc=None, types=None):
         """
         Walk through the element and all its children (sub-elements),
         applying the provided function ``action``.
@@ -240,6 +313,11 @@ class Element(object):
             doc = Doc(Para(Str('a')))
             altered = doc.walk(no_action)
 
+        If the action only cares about some element types, pass them in
+        ``types``; the action will not be called for other elements,
+        and subtrees that can't contain these types will be skipped
+        (e.g. ``doc.walk(action, types=MetaString)`` won't go through
+        the body of the document).
 
         :param action: function that takes (element, doc) as arguments.
         :type action: :class:`function`
@@ -248,6 +326,9 @@ class Element(object):
             other variables). Only use this variable if for some reason
             you don't want to use the current document of an element.
         :type doc: :class:`.Doc`
+        :param types: element type (or tuple of types) that ``action``
+            applies to (default is all elements)
+        :type types: ``type`` | :class:`tuple` | ``None``
         :rtype: :class:`Element` | ``[]`` | ``None``
         """
 
@@ -255,30 +336,326 @@ class Element(object):
         if doc is None:
             doc = self.doc
 
-        # First iterate over children
-        for child in self._children:
-            obj = getattr(self, child)
-            if obj is None:
-                pass  # Empty table headers or captions
+        if types is None:
+            return _walk(self, action, doc)
+
+        if not isinstance(types, tuple):
+            types = (types,)
+        return _walk(self, action, doc, types, _skipped_types(types))
+
+    def iter(self, types=None):
+        """
+        Iterate over the element and all its children (sub-elements),
+        in the same order as :meth:`walk` (children before their parents).
+
+        Unlike :meth:`walk`, this never modifies the document, so it's
+        faster when only reading it (but don't add or remove elements
+        while iterating).
+
+        :param types: element type (or tuple of types) to return
+            (default is all elements); subtrees that can't contain
+            these types are skipped
+        :type types: ``type`` | :class:`tuple` | ``None``
+        :rtype: iterator of :class:`Element`
+        """
+        if types is None:
+            return _iter(self, None, frozenset())
+
+        if not isinstance(types, tuple):
+            types = (types,)
+        return _iter(self, types, _skipped_types(types))
+
+    def find_all(self, types=None, condition=None):
+        """
+        Return an iterator over the elements (including this one) of the
+        given types for which ``condition(element)`` is true,
+        in the same order as :meth:`iter`.
+
+        Example:
+
+            >>> urls = [e.url for e in doc.find_all(Link)]
+
+        :param types: element type (or tuple of types)
+            (default is all elements)
+        :type types: ``type`` | :class:`tuple` | ``None``
+        :param condition: function that takes an element and
+            returns True or False (default is None, which accepts
+            any element)
+        :type condition: :class:`function` | ``None``
+        :rtype: iterator of :class:`Element`
+        """
+        if condition is None:
+            return self.iter(types)
+        return (elem for elem in self.iter(types) if condition(elem))
+
+    def find_first(self, types=None, condition=None):
+        """
+        Return the first element found by :meth:`find_all`,
+        or None if there isn't any.
+
+        :rtype: :class:`Element` | ``None``
+        """
+        return next(self.find_all(types, condition), None)
 
-            elif hasattr(child, 'walk'):
-                ans = obj.walk(action, doc)
-                setattr(self, child, ans)
 
+# ---------------------------
+# Walk
+# ---------------------------
+
+# Element types that can be direct children of each element type
+# (filled in by elements.py); used to find the subtrees that can be skipped
+# when walking with types=...
+CHILD_TYPES = {}
+_skipped_cache = {}
+
+
+def _skipped_types(types):
+    """
+    Return the set of element types whose subtrees can't contain
+    any element of the given types
+    """
+    key = types, len(CHILD_TYPES)
+    skip = _skipped_cache.get(key)
+    if skip is None:
+        # Find all the types that can be reached from each type
+        reachable = {}
+        for cls, children in CHILD_TYPES.items():
+            seen = set()
+            stack = list(children)
+            while stack:
+                child = stack.pop()
+                if child not in seen:
+                    seen.add(child)
+                    stack.extend(CHILD_TYPES.get(child, ()))
+            reachable[cls] = seen
+
+        skip = _skipped_cache[key] = frozenset(
+            cls for cls, seen in reachable.items()
+            if not issubclass(cls, types) and
+            all(child in CHILD_TYPES and not issubclass(child, types)
+                for child in seen))
+    return skip
+
+
+# Kinds of children, as used by _walk()
+_LIST, _DICT, _ELEMENT = 1, 2, 3
+
+
+def _walk(root, action, doc, types=None, skip=frozenset()):
+    """
+    Implementation of ``Element.walk()``.
+
+    Instead of recursing into each child, the elements being walked
+    are kept in an explicit stack, so deeply nested documents don't
+    reach the recursion limit. If ``types`` is not None, the action is
+    only applied to elements of these types, and the elements in ``skip``
+    are not walked (see ``_skipped_types()``).
+
+    Each stack frame holds (element, index of the next child attribute,
+    kind of the current child, the child, its items, index of the next
+    item, altered items); altered lists of items are only built once
+    an item gets replaced, and then only the new items are type-checked.
+    """
+    stack = []
+    elem, ci, kind, obj, items, i, ans = root, 0, None, None, None, 0, None
+
+    while True:
+        if kind is None:
+            # Go to the next child attribute of the element
+            children = elem._children
+            if ci < len(children):
+                obj = getattr(elem, children[ci])
+                ci += 1
+                i = 0
+                if obj is None:
+                    pass  # Empty table headers or captions
+                elif isinstance(obj, ListContainer):
+                    kind, items, ans = _LIST, obj.list, None
+                elif isinstance(obj, DictContainer):
+                    kind, items, ans = _DICT, list(obj.items()), []
+                elif isinstance(obj, Element):
+                    kind, items, ans = _ELEMENT, (obj,), obj
+                elif hasattr(obj, 'walk'):
+                    ans = obj.walk(action, doc)
+                    if not _unchanged(obj, ans):
+                        setattr(elem, children[ci - 1], ans)
+                else:
+                    raise TypeError(type(obj))
+                continue
+
+            # All the children have been walked; apply the action
+            altered = None
+            if types is None or isinstance(elem, types):
+                altered = action(elem, doc)
+            if altered is None:
+                altered = elem
+            if not stack:
+                return altered
+
+            # Go back to the parent, and store the result
+            item = elem
+            elem, ci, kind, obj, items, i, ans = stack.pop()
+            if kind == _LIST:
+                if ans is None:
+                    if altered is item:
+                        continue
+                    ans = items[:i - 1]
+                if altered is item:
+                    ans.append(item)
+                elif type(altered) == list:
+                    # Splice the returned elements
+                    oktypes, parent, location = \
+                        obj.oktypes, obj.parent, obj.location
+                    ans.extend(attach(check_type(x, oktypes), parent, location)
+                               for x in altered)
+                else:
+                    ans.append(attach(check_type(altered, obj.oktypes),
+                                      obj.parent, obj.location))
+            elif kind == _DICT:
+                ans.append((items[i - 1][0], altered))
+            else:
+                ans = altered
+            continue
+
+        # Go to the next item of the current child
+        if i < len(items):
+            if kind == _LIST:
+                item = items[i]
+                if type(item) in skip:
+                    if ans is not None:
+                        ans.append(item)
+                    i += 1
+                    continue
+                if type(item) == str or type(obj) is SharedListContainer:
+                    item = obj[i]  # Decode lazy items, locate shared ones
+            elif kind == _DICT:
+                key, item = items[i]
+                if type(item) in skip:
+                    ans.append((key, item))
+                    i += 1
+                    continue
+            else:
+                item = items[i]
+                if type(item) in skip:
+                    i += 1
+                    continue
+
+            stack.append((elem, ci, kind, obj, items, i + 1, ans))
+            elem, ci, kind, obj, items, i, ans = \
+                item, 0, None, None, None, 0, None
+            continue
+
+        # All the items have been walked; only update the child if altered
+        child = elem._children[ci - 1]
+        if kind == _LIST:
+            if ans is not None:
+                # Update the list in place (the new items were already
+                # checked above) instead of building a new container
+                items[:] = ans
+                obj._changed()
+        elif kind == _DICT:
+            ans = [(k, v) for k, v in ans if v != []]
+            if not _unchanged(obj, ans):
+                setattr(elem, child, ans)
+        elif ans is not obj:
+            setattr(elem, child, ans)
+        kind = None
+
+
+def _iter(root, types, skip):
+    """
+    Implementation of ``Element.iter()``; like ``_walk()``, it uses an
+    explicit stack where each frame is [element, its children, index of
+    the next child]
+    """
+    stack = [[root, _child_elements(root, skip), 0]]
+    while stack:
+        frame = stack[-1]
+        children, i = frame[1], frame[2]
+        if i < len(children):
+            frame[2] = i + 1
+            child = children[i]
+            if type(child) is tuple:
+                container, j = child
+                child = container[j]  # Locate shared elements
+            if child._children:
+                stack.append([child, _child_elements(child, skip), 0])
+            elif types is None or isinstance(child, types):
+                yield child  # Shortcut for elements without children
+        else:
+            stack.pop()
+            elem = frame[0]
+            if types is None or isinstance(elem, types):
+                yield elem
+
+
+def _child_elements(elem, skip):
+    """
+    Return a list with the children of the element, except the ones
+    in ``skip``
+    """
+    ans = []
+    for child in elem._children:
+        obj = getattr(elem, child)
+        if obj is None:
+            pass  # Empty table headers or captions
+        elif isinstance(obj, ListContainer):
+            items = obj.list
+            if type(obj) is SharedListContainer:
+                # Shared elements are located when _iter() reaches them
+                ans.extend((obj, i) for i in range(len(items))
+                           if type(items[i]) not in skip)
+            elif skip:
+                ans.extend(obj[i] for i in range(len(items))  # Decodes lazy items
+                           if type(items[i]) not in skip)
             else:
-                raise TypeError(type(obj))
+                ans.extend(obj)
+        elif isinstance(obj, DictContainer):
+            ans.extend(item for item in obj.values()
+                       if type(item) not in skip)
+        elif isinstance(obj, Element):
+            if type(obj) not in skip:
+                ans.append(obj)
+        else:
+            raise TypeError(type(obj))
+    return ans
+
+
+def _unchanged(obj, ans):
+    """
+    Return True if walking through ``obj`` returned the same items
+    """
+    if isinstance(obj, ListContainer):
+        items = obj.list
+        return len(ans) == len(items) and all(map(is_, ans, items))
+    elif isinstance(obj, DictContainer):
+        items = obj.dict
+        return len(ans) == len(items) and \
+            all(items.get(k) is v for k, v in ans)
+    else:
+        return ans is obj
 
-        # Then apply the action to the element
-        altered = action(self, doc)
 
-        return self if altered is None else altered
+_slots = {}  # Cache of the slots of each element type
+
+
+def _all_slots(cls):
+    """
+    Return the slots of an element type, including the inherited ones
+    (each class only lists the slots it adds)
+    """
+    slots = _slots.get(cls)
+    if slots is None:
+        slots = _slots[cls] = [key for c in reversed(cls.__mro__)
+                               for key in c.__dict__.get('__slots__', ())]
+    return slots
 
 
 class Inline(Element):
     """
     Base class of all inline elements
     """
-    __slots__ = ['_content']
+    __slots__ = []
     _children = ['content']
     # child_type = Inline
 
@@ -297,6 +674,7 @@ class InlineText(Inline):
     __slots__ = ['text', 'format']
     _children = []
     default_format = None
+    formats = RAW_FORMATS
 
     def __init__(self, text: str, format: str=None):
         super(Inline, self).__init__()
@@ -304,7 +682,7 @@ class InlineText(Inline):
             format = self.default_format
 
         self.text = check_type(text, str)
-        self.format = check_group(format, RAW_FORMATS)
+        self.format = check_group(format, self.formats)
 
     def _slots_to_json(self):
         return [self.format, self.text]
@@ -314,7 +692,7 @@ class Block(Element):
     """
     Base class of all block elements
     """
-    __slots__ = ['_content', 'identifier', 'classes', 'attributes']
+    __slots__ = ['_classes', '_attributes']
     _children = ['content']
     child_type = Inline
 
@@ -350,11 +728,11 @@ class InlineBlock(Inline, Block):
     """
     Base class of all inline block elements (e.g. Span)
     """
-    __slots__ = ['_content', 'identifier', 'classes', 'attributes']
+    __slots__ = []
     _children = ['content']
 
     def __init__(self, *args: List[Inline], **kwargs):
-        super(InlineBlock, self).__init__(**kwargs)
+        Block.__init__(self, **kwargs)
         self._set_content(args, Inline)
 
 
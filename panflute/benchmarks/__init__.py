@@ -0,0 +1,194 @@
+"""
+Benchmarks of panflute itself, run over the documents bundled in
+``tests/input`` (by default) and over generated documents, each of them
+scaled up by repeating its blocks (1x, 10x and 100x by default).
+
+Usage (from the root folder of the repository):
+
+    python -m panflute.benchmarks memory [options]
+    python -m panflute.benchmarks throughput [options]
+
+Run with ``--help`` for the options. Results are written as JSON
+(see :func:`write_report`), so they can be compared across releases.
+"""
+
+# ---------------------------
+# Imports
+# ---------------------------
+
+import os
+import sys
+import json
+import glob
+import platform
+
+from ..version import __version__
+from ..backends import get_json_backend
+
+
+# ---------------------------
+# Constants
+# ---------------------------
+
+CORPUS = './tests/input/*/benchmark.json'
+SCALES = (1, 10, 100)
+SYNTHETIC = 'synthetic'
+API_VERSION = [1, 17, 0, 4]
+
+
+# ---------------------------
+# Documents
+# ---------------------------
+
+def corpus_files(pattern=CORPUS):
+    """
+    Return the paths of the JSON documents matching ``pattern``
+    """
+    return sorted(glob.glob(pattern))
+
+
+def document_name(source):
+    """
+    Return a short name for a document path (the name of its folder)
+    """
+    if source == SYNTHETIC:
+        return source
+    return os.path.basename(os.path.dirname(os.path.abspath(source)))
+
+
+def read_document(source, scale=1):
+    """
+    Return the JSON text of a document (a path, or ``'synthetic'`` for
+    :func:`synthetic_document`), with its blocks repeated ``scale`` times
+    """
+    if source == SYNTHETIC:
+        return synthetic_document(scale)
+    with open(source, encoding='utf-8') as f:
+        raw = f.read()
+    return scale_document(raw, scale)
+
+
+def scale_document(raw, scale):
+    """
+    Repeat the blocks of a JSON-encoded document ``scale`` times
+    """
+    if scale == 1:
+        return raw
+    data = json.loads(raw)
+    if isinstance(data, list):
+        data[1] = data[1] * scale  # Pandoc legacy
+    else:
+        data['blocks'] = data['blocks'] * scale
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+
+
+def synthetic_document(scale=1):
+    """
+    Return the JSON text of a generated document that resembles a book
+    chapter (headers, prose with emphasis and links, code blocks, lists
+    and divs), with ``scale`` sections
+    """
+    blocks = []
+    for i in range(scale):
+        blocks.extend(_synthetic_section(i))
+    return json.dumps({'pandoc-api-version': API_VERSION,
+                       'meta': {'title': {'t': 'MetaInlines',
+                                          'c': _words('A generated document')}},
+                       'blocks': blocks},
+                      separators=(',', ':'))
+
+
+def _words(text):
+    ans = []
+    for word in text.split():
+        if ans:
+            ans.append({'t': 'Space'})
+        ans.append({'t': 'Str', 'c': word})
+    return ans
+
+
+def _attr(identifier='', classes=(), attributes=()):
+    return [identifier, list(classes), [list(kv) for kv in attributes]]
+
+
+_SENTENCE = 'The quick brown fox jumps over the lazy dog, again and again.'
+
+
+def _synthetic_section(i):
+    para = []
+    for j in range(8):
+        if para:
+            para.append({'t': 'SoftBreak'})
+        para.extend(_words(_SENTENCE))
+        para.extend([{'t': 'Space'},
+                     {'t': 'Emph', 'c': _words('emphasized words')},
+                     {'t': 'Space'},
+                     {'t': 'Link', 'c': [_attr(), _words('a link'),
+                                         ['https://example.com/{}'.format(j),
+                                          '']]}])
+    items = [[{'t': 'Plain', 'c': _words('Item number {}'.format(j))}]
+             for j in range(5)]
+    return [
+        {'t': 'Header', 'c': [2, _attr('section-{}'.format(i)),
+                              _words('Section {}'.format(i))]},
+        {'t': 'Para', 'c': para},
+        {'t': 'Para', 'c': para},
+        {'t': 'CodeBlock', 'c': [_attr(classes=['python']),
+                                 'def f(x):\n    return x + 1\n']},
+        {'t': 'BulletList', 'c': items},
+        {'t': 'Div', 'c': [_attr(classes=['note'],
+                                 attributes=[('lang', 'en')]),
+                           [{'t': 'Para', 'c': para}]]},
+    ]
+
+
+def documents(files=None, scales=SCALES, synthetic=True):
+    """
+    Return a list of ``(source, scale)`` pairs, for each of the corpus
+    files (default is :data:`CORPUS`), and the synthetic document,
+    at each of the scales
+    """
+    sources = corpus_files() if files is None else list(files)
+    if synthetic:
+        sources.append(SYNTHETIC)
+    return [(source, scale) for source in sources for scale in scales]
+
+
+# ---------------------------
+# Reports
+# ---------------------------
+
+def environment():
+    """
+    Return a dict describing the versions used to run the benchmarks
+    """
+    return {
+        'panflute': __version__,
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'json_backend': get_json_backend().name,
+    }
+
+
+def write_report(benchmark, results, output=None, **options):
+    """
+    Write the results of a benchmark as JSON (with sorted keys and one
+    result per line, so reports can be compared with ``diff``)
+
+    :param benchmark: name of the benchmark (e.g. 'memory')
+    :param results: list of dicts, one per document and scale
+    :param output: path of the output file (default is :data:`sys.stdout`)
+    :param options: options used to run the benchmark
+    """
+    report = {'benchmark': benchmark,
+              'environment': environment(),
+              'options': options}
+    head = json.dumps(report, sort_keys=True)[:-1]
+    lines = [json.dumps(result, sort_keys=True) for result in results]
+    text = head + ', "results": [\n' + ',\n'.join(lines) + '\n]}\n'
+    if output is None:
+        sys.stdout.write(text)
+    else:
+        with open(output, 'w', encoding='utf-8') as f:
+            f.write(text)
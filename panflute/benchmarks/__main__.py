@@ -0,0 +1,25 @@
+"""
+Run a benchmark: ``python -m panflute.benchmarks <benchmark> [options]``
+"""
+
+import sys
+
+from . import memory, throughput
+
+BENCHMARKS = {
+    'memory': memory.main,
+    'throughput': throughput.main,
+}
+
+
+def main(args=None):
+    args = sys.argv[1:] if args is None else args
+    if not args or args[0] not in BENCHMARKS:
+        print('Usage: python -m panflute.benchmarks {{{}}} [options]'.format(
+            ','.join(sorted(BENCHMARKS))), file=sys.stderr)
+        sys.exit(2)
+    BENCHMARKS[args[0]](args[1:])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,173 @@
+"""
+Memory used by the element tree of each document, as measured by
+``tracemalloc`` (bytes and number of memory blocks allocated by
+:func:`.load`), by the peak resident set size of the process, and
+per element type (with ``sys.getsizeof``).
+
+Each document is loaded in a new process, so the peak RSS of one
+document doesn't hide the next one.
+
+Usage (from the root folder of the repository):
+
+    python -m panflute.benchmarks memory [--scales 1 10] [--output FILE]
+"""
+
+# ---------------------------
+# Imports
+# ---------------------------
+
+import io
+import sys
+import argparse
+import tracemalloc
+import multiprocessing
+from collections import Counter
+
+from . import documents, document_name, read_document, write_report, SCALES
+from ..io import load
+from ..base import Element
+from ..containers import ListContainer, DictContainer
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+# ---------------------------
+# Functions
+# ---------------------------
+
+def peak_rss():
+    """
+    Return the peak resident set size of the process in bytes
+    (or None if it can't be measured on this platform)
+    """
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss if sys.platform == 'darwin' else rss * 1024  # KiB on Linux
+
+
+def element_size(elem):
+    """
+    Return the bytes used by an element and the objects it owns
+    (its containers, strings, classes, attributes, etc.), but not by
+    its children or its parent
+    """
+    size = sys.getsizeof(elem)
+    for cls in type(elem).__mro__:
+        for key in cls.__dict__.get('__slots__', ()):
+            if key in ('parent', 'location', '__dict__'):
+                continue
+            value = getattr(elem, key, None)
+            if value is None or isinstance(value, Element):
+                continue
+            if isinstance(value, ListContainer):
+                size += sys.getsizeof(value) + sys.getsizeof(value.list)
+                if value.positions is not None:
+                    size += sys.getsizeof(value.positions)
+            elif isinstance(value, DictContainer):
+                size += sys.getsizeof(value) + sys.getsizeof(value.dict)
+            elif isinstance(value, (list, tuple, dict)):
+                size += sys.getsizeof(value)
+                items = value.items() if isinstance(value, dict) else value
+                size += sum(sys.getsizeof(item) for item in items)
+            else:
+                size += sys.getsizeof(value)
+    return size
+
+
+def element_sizes(doc):
+    """
+    Return a dict from element tag to ``{'count': ..., 'bytes': ...,
+    'bytes_per_node': ...}``; shared elements are counted once
+    """
+    counts = Counter()
+    sizes = Counter()
+    seen = set()
+    for elem in doc.iter():
+        if id(elem) in seen:
+            continue
+        seen.add(id(elem))
+        counts[elem.tag] += 1
+        sizes[elem.tag] += element_size(elem)
+    return {tag: {'count': counts[tag], 'bytes': sizes[tag],
+                  'bytes_per_node': round(sizes[tag] / counts[tag], 1)}
+            for tag in counts}
+
+
+def measure(source, scale, **options):
+    """
+    Load a document with the given :func:`.load` options and return
+    a dict with its memory usage
+    """
+    raw = read_document(source, scale)
+    rss = peak_rss()
+    tracemalloc.start()
+    doc = load(io.StringIO(raw), **options)
+    traced, traced_peak = tracemalloc.get_traced_memory()
+    blocks = sum(stat.count for stat in
+                 tracemalloc.take_snapshot().statistics('filename'))
+    tracemalloc.stop()
+    rss_after = peak_rss()
+
+    types = element_sizes(doc)
+    nodes = sum(1 for _ in doc.iter())
+    return {
+        'document': document_name(source),
+        'scale': scale,
+        'json_bytes': len(raw.encode('utf-8')),
+        'nodes': nodes,
+        'traced_bytes': traced,
+        'traced_peak_bytes': traced_peak,
+        'traced_blocks': blocks,
+        'bytes_per_node': round(traced / nodes, 1),
+        'blocks_per_node': round(blocks / nodes, 2),
+        'peak_rss_bytes': rss_after,
+        'peak_rss_increase_bytes': None if rss is None else rss_after - rss,
+        'types': types,
+    }
+
+
+def run(files=None, scales=SCALES, synthetic=True, **options):
+    """
+    Measure every document at every scale (each in a new process)
+    and return the list of results
+    """
+    context = multiprocessing.get_context('spawn')
+    results = []
+    for source, scale in documents(files, scales, synthetic):
+        with context.Pool(1) as pool:
+            result = pool.apply(measure, (source, scale), options)
+        print('{:<20} {:>5}x {:>9} nodes {:>8.1f} bytes/node'.format(
+            result['document'], scale, result['nodes'],
+            result['bytes_per_node']), file=sys.stderr)
+        results.append(result)
+    return results
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m panflute.benchmarks memory',
+        description='Measure the memory used by loaded documents')
+    parser.add_argument('files', nargs='*',
+                        help='JSON documents (default is tests/input/*)')
+    parser.add_argument('--scales', nargs='+', type=int, default=SCALES,
+                        help='times the blocks of each document are '
+                             'repeated (default is 1 10 100)')
+    parser.add_argument('--no-synthetic', dest='synthetic',
+                        action='store_false',
+                        help="don't include the generated document")
+    parser.add_argument('--no-validate', dest='validate',
+                        action='store_false',
+                        help='load with validate=False')
+    parser.add_argument('--share-empty', action='store_true',
+                        help='load with share_empty=True')
+    parser.add_argument('--output', help='JSON output file (default is stdout)')
+    args = parser.parse_args(args)
+
+    options = {'validate': args.validate, 'share_empty': args.share_empty}
+    results = run(args.files or None, args.scales, args.synthetic, **options)
+    write_report('memory', results, args.output,
+                 scales=list(args.scales), **options)
@@ -0,0 +1,184 @@
+"""
+Time each phase of a filter run separately:
+
+- ``parse``: JSON text to plain lists and dicts (with the JSON backend)
+- ``construct``: plain objects to elements (with :func:`.from_json`)
+- ``walk``: :meth:`.Element.walk` with an action that does nothing
+- ``walk_mutating``: :meth:`.Element.walk` with an action that modifies
+  every :class:`.Str` and replaces every :class:`.Emph`
+- ``to_json``: elements to plain objects (with :meth:`.Element.to_json`)
+- ``encode``: plain objects to JSON text (with the JSON backend)
+
+together with :func:`.load` and :func:`.dump` end to end (``load``
+parses and constructs in a single pass, with the standard library
+parser), and ``json_encode``, which encodes the parsed objects directly.
+The round trip through the JSON backend alone (``parse + json_encode``)
+is the baseline, so the overhead added by panflute is explicit:
+``overhead`` is the time of ``parse + construct + to_json + encode``
+divided by the time of the baseline.
+
+Every phase is run ``repeat`` times and the fastest time is reported.
+``walk_mutating`` gets a newly constructed document for every run.
+
+Usage (from the root folder of the repository):
+
+    python -m panflute.benchmarks throughput [--scales 1 10] [--output FILE]
+"""
+
+# ---------------------------
+# Imports
+# ---------------------------
+
+import io
+import sys
+import argparse
+from timeit import default_timer
+
+from . import documents, document_name, read_document, write_report, SCALES
+from ..io import load, dump
+from ..elements import Doc, Str, Emph, Strong, from_json
+from ..backends import get_json_backend, build
+
+
+# ---------------------------
+# Constants
+# ---------------------------
+
+PHASES = ('parse', 'construct', 'walk', 'walk_mutating', 'to_json', 'encode',
+          'load', 'dump', 'json_encode')
+
+
+# ---------------------------
+# Actions
+# ---------------------------
+
+def noop_action(elem, doc):
+    pass
+
+
+def mutating_action(elem, doc):
+    if type(elem) == Str:
+        elem.text = elem.text.upper()
+    elif type(elem) == Emph:
+        return Strong(*elem.content)
+
+
+# ---------------------------
+# Functions
+# ---------------------------
+
+def construct(obj):
+    """
+    Convert parsed JSON into a :class:`.Doc` (as done by :func:`.load`)
+    """
+    doc = build(obj, from_json)
+    if not isinstance(doc, Doc):
+        metadata, items = doc  # Pandoc legacy
+        doc = Doc(*items, metadata=metadata)
+    return doc
+
+
+def best_time(func, arg, repeat, setup=None):
+    """
+    Return the fastest of ``repeat`` runs of ``func(arg)``, in seconds
+
+    If ``setup`` is given, each run calls ``func(setup(arg))`` instead,
+    without timing ``setup``; use it when ``func`` modifies its argument
+    """
+    best = None
+    for _ in range(repeat):
+        value = arg if setup is None else setup(arg)
+        start = default_timer()
+        func(value)
+        elapsed = default_timer() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
+
+
+def _dump_to_string(doc):
+    with io.StringIO() as f:
+        dump(doc, f)
+        return f.getvalue()
+
+
+def measure(source, scale, repeat=5):
+    """
+    Time every phase on a document, and return a dict with the results
+    """
+    backend = get_json_backend()
+    raw = read_document(source, scale)
+
+    obj = backend.loads(raw)
+    doc = construct(obj)
+    encoded = doc.to_json()
+    nodes = sum(1 for _ in doc.iter())
+
+    seconds = {
+        'parse': best_time(backend.loads, raw, repeat),
+        'construct': best_time(construct, obj, repeat),
+        'walk': best_time(lambda d: d.walk(noop_action), doc, repeat),
+        'walk_mutating': best_time(
+            lambda d: d.walk(mutating_action), obj, repeat, setup=construct),
+        'to_json': best_time(Doc.to_json, doc, repeat),
+        'encode': best_time(backend.dumps, encoded, repeat),
+        'load': best_time(lambda text: load(io.StringIO(text)), raw, repeat),
+        'dump': best_time(_dump_to_string, doc, repeat),
+        'json_encode': best_time(backend.dumps, obj, repeat),
+    }
+
+    panflute = sum(seconds[phase] for phase in
+                   ('parse', 'construct', 'to_json', 'encode'))
+    baseline = seconds['parse'] + seconds['json_encode']
+    return {
+        'document': document_name(source),
+        'scale': scale,
+        'json_bytes': len(raw.encode('utf-8')),
+        'nodes': nodes,
+        'seconds': {phase: round(seconds[phase], 6) for phase in PHASES},
+        'overhead': round(panflute / baseline, 2),
+    }
+
+
+def run(files=None, scales=SCALES, synthetic=True, repeat=5):
+    """
+    Time every document at every scale and return the list of results
+    """
+    print('{:<20} {:>6} {:>9} '.format('document', 'scale', 'nodes') +
+          ' '.join('{:>13}'.format(phase) for phase in PHASES) +
+          ' {:>9}'.format('overhead'), file=sys.stderr)
+    results = []
+    for source, scale in documents(files, scales, synthetic):
+        result = measure(source, scale, repeat)
+        print('{:<20} {:>5}x {:>9} '.format(
+            result['document'], scale, result['nodes']) +
+            ' '.join('{:>13.4f}'.format(result['seconds'][phase])
+                     for phase in PHASES) +
+            ' {:>9.2f}'.format(result['overhead']), file=sys.stderr)
+        results.append(result)
+    return results
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m panflute.benchmarks throughput',
+        description='Time each phase of loading, walking and dumping '
+                    'documents')
+    parser.add_argument('files', nargs='*',
+                        help='JSON documents (default is tests/input/*)')
+    parser.add_argument('--scales', nargs='+', type=int, default=SCALES,
+                        help='times the blocks of each document are '
+                             'repeated (default is 1 10 100)')
+    parser.add_argument('--no-synthetic', dest='synthetic',
+                        action='store_false',
+                        help="don't include the generated document")
+    parser.add_argument('--repeat', type=int, default=5,
+                        help='runs of each phase; the fastest is reported '
+                             '(default is 5)')
+    parser.add_argument('--output', help='JSON output file (default is stdout)')
+    args = parser.parse_args(args)
+
+    results = run(args.files or None, args.scales, args.synthetic,
+                  args.repeat)
+    write_report('throughput', results, args.output,
+                 scales=list(args.scales), repeat=args.repeat)
@@ -1,9 +1,7 @@
 
 __all__ = ['LIST_NUMBER_STYLES', 'LIST_NUMBER_DELIMITERS', 'TABLE_ALIGNMENT',
            'QUOTE_TYPES', 'CITATION_MODE', 'MATH_FORMATS', 'RAW_FORMATS',
-           'SPECIAL_ELEMENTS', 'EMPTY_ELEMENTS']
-
-from .elements import Null, Space, HorizontalRule, SoftBreak, LineBreak
+           'SPECIAL_ELEMENTS']
 
 
 # ---------------------------
@@ -31,5 +29,3 @@ RAW_FORMATS = {'html', 'tex', 'latex'}
 
 SPECIAL_ELEMENTS = LIST_NUMBER_STYLES | LIST_NUMBER_DELIMITERS | \
                    MATH_FORMATS | TABLE_ALIGNMENT | QUOTE_TYPES | CITATION_MODE
-
-EMPTY_ELEMENTS = {Null, Space, HorizontalRule, SoftBreak, LineBreak}
@@ -7,9 +7,14 @@ object, and the attribute of the parent object that they correspond to.
 # Imports
 # ---------------------------
 
-from collections import OrderedDict, MutableSequence, MutableMapping
+from collections import OrderedDict
+try:
+    from collections.abc import MutableSequence, MutableMapping
+except ImportError:  # Python 2
+    from collections import MutableSequence, MutableMapping
 from itertools import chain
-from .utils import check_type, encode_dict  # check_group
+import json
+from .utils import check_type, check_types, encode_dict  # check_group
 
 import sys
 py2 = sys.version_info[0] == 2
@@ -22,7 +27,7 @@ if not py2: basestring = str
 # These are list and OrderedDict containers that
 #  (a) track the identity of their parents, and
 #  (b) track the parent's property where they are stored
-# They attach these two to the elements requested through __getattr__
+# They attach these two to the elements when they are inserted
 
 class ListContainer(MutableSequence):
     """
@@ -41,20 +46,43 @@ class ListContainer(MutableSequence):
     # Based on http://stackoverflow.com/a/3488283
     # See also https://docs.python.org/3/library/collections.abc.html
 
-    __slots__ = ['list', 'oktypes', 'parent', 'location']
+    __slots__ = ['list', 'oktypes', 'parent', 'location', 'positions']
 
     def __init__(self, *args, oktypes=object, parent=None, location: str=None):
         self.oktypes = oktypes
         self.parent = parent
         self.location = location
+        self.positions = None
 
         self.list = list()
 
         # self.oktypes must be set first
         for value in args:
-            value = value.list if isinstance(value, ListContainer) else list(value)
+            value = value.list if isinstance(value, ListContainer) else value
             self.extend(value)
 
+    @classmethod
+    def _new(cls, items, oktypes, parent, location=None):
+        """
+        Build a container around an already validated list (such as the
+        elements decoded from pandoc's JSON output), without copying it
+        or type-checking its items
+        """
+        obj = cls._wrap(items, oktypes, parent, location)
+        _attach_all(items, parent, location)
+        return obj
+
+    @classmethod
+    def _wrap(cls, items, oktypes, parent, location):
+        # Like _new() but the items must already be attached to the parent
+        obj = cls.__new__(cls)
+        obj.list = items
+        obj.oktypes = oktypes
+        obj.parent = parent
+        obj.location = location
+        obj.positions = None
+        return obj
+
     def __contains__(self, item):
         return item in self.list
 
@@ -62,25 +90,107 @@ class ListContainer(MutableSequence):
         return len(self.list)
 
     def __getitem__(self, i):
+        # The items were attached to the parent when they were inserted
         if isinstance(i, int):
-            return attach(self.list[i], self.parent, self.location)
+            return self.list[i]
         else:
-            newlist = self.list.__getitem__(i)
-            obj = ListContainer(*newlist,
-                                oktypes=self.oktypes, parent=self.parent)
-            obj.location = self.location
-            return obj
+            # Shallow copy, the items are not checked or attached again
+            return ListContainer._wrap(self.list[i], self.oktypes,
+                                       self.parent, self.location)
+
+    def __iter__(self):
+        return iter(self.list)
+
+    def __reversed__(self):
+        return reversed(self.list)
 
     def __delitem__(self, i):
         del self.list[i]
+        self._changed()
 
     def __setitem__(self, i, v):
-        v = check_type(v, self.oktypes)
-        self.list[i] = v
+        if isinstance(i, slice):
+            self.list[i] = self._check(v)
+        else:
+            if not isinstance(v, self.oktypes):  # Inlined fast path
+                v = check_type(v, self.oktypes)
+            self.list[i] = attach(v, self.parent, self.location)
+        self._changed()
 
     def insert(self, i, v):
-        v = check_type(v, self.oktypes)
-        self.list.insert(i, v)
+        if not isinstance(v, self.oktypes):  # Inlined fast path
+            v = check_type(v, self.oktypes)
+        self.list.insert(i, attach(v, self.parent, self.location))
+        self._changed()
+
+    def extend(self, values):
+        """
+        Append all the items of an iterable; unlike ``append()`` in a loop,
+        the items are type-checked as a batch and added at once
+        """
+        values = self._check(values)
+        self.list.extend(values)
+        self._changed()
+
+    def splice(self, i, j, values):
+        """
+        Replace the items from position ``i`` up to (but excluding)
+        position ``j`` with the items of an iterable; same as
+        ``self[i:j] = values``
+
+        :param i: start position
+        :type i: ``int``
+        :param j: end position
+        :type j: ``int``
+        :param values: new items
+        """
+        self[i:j] = values
+
+    def replace_all(self, values):
+        """
+        Replace all the items with the items of an iterable
+        (this keeps the container, so there is no need to set it
+        again on the parent)
+        """
+        self.list[:] = self._check(values)
+        self._changed()
+
+    def _check(self, values):
+        # Type-check and attach a batch of new items
+        values = check_types(values, self.oktypes)
+        parent, location = self.parent, self.location
+        for value in values:
+            attach(value, parent, location)
+        return values
+
+    def index(self, value, start=0, stop=None):
+        """
+        Return the position of an item; this takes constant time as the
+        positions of all items are cached (until the list is modified)
+        """
+        if start or stop is not None:
+            return super(ListContainer, self).index(value, start, stop)
+
+        positions = self.positions
+        if positions is not None:
+            i = positions.get(id(value))
+            if i is not None and i < len(self.list) and \
+                    self.list[i] is value:
+                return i
+
+        # Missing or outdated (if .list was modified directly)
+        items = self.list
+        n = len(items)
+        positions = self.positions = {id(item): n - 1 - i for i, item
+                                      in enumerate(reversed(items))}
+        i = positions.get(id(value))
+        if i is not None:
+            return i
+        return super(ListContainer, self).index(value)
+
+    def _changed(self):
+        # Called after the list is modified
+        self.positions = None
 
     def __str__(self):
         return self.__repr__()
@@ -102,6 +212,136 @@ class ListContainer(MutableSequence):
         return ans
 
 
+class LazyListContainer(ListContainer):
+    """
+    ListContainer where some of the items are still JSON-encoded strings,
+    as returned by :func:`.load` with ``lazy=True``.
+
+    These items are decoded (with the ``decode`` function) and replaced
+    the first time they are accessed, and the ones that are never accessed
+    are written back as-is by :func:`.dump`.
+
+    The original JSON of the decoded items is also kept in ``raw``, and
+    written back instead of the item when it's encoded the same (see
+    ``get_raw()``), so unmodified items are also written back as-is.
+    **This class shouldn't be instantiated directly by users.**
+
+    :param decode: function that converts a JSON string into an element
+    """
+
+    __slots__ = ['decode', 'raw']
+
+    def __init__(self, *args, decode=None, **kwargs):
+        self.decode = decode
+        self.raw = {}
+        super(LazyListContainer, self).__init__(*args, **kwargs)
+
+    @classmethod
+    def _new(cls, items, oktypes, parent, location=None, decode=None):
+        # The items are attached as they get decoded
+        obj = cls._wrap(items, oktypes, parent, location)
+        obj.decode = decode
+        obj.raw = {}
+        return obj
+
+    def _materialize(self, i):
+        item = self.list[i]
+        if type(item) == str:
+            text = item
+            item = self.list[i] = self.decode(text)
+            attach(item, self.parent, self.location)
+            self.raw[item] = text
+            if self.positions is not None:
+                self.positions[id(item)] = i % len(self.list)
+        return item
+
+    def get_raw(self, item, dumps):
+        """
+        Return the JSON of a decoded item, encoded with ``dumps``: its
+        original JSON if the item was not modified, else the new one.
+
+        The item is compared with its original JSON instead of tracking
+        its changes, so modifying elements doesn't get any slower.
+        """
+        text = self.raw.get(item)
+        encoded = dumps(item.to_json())
+        if text is None or text == encoded:
+            return encoded
+        # Pandoc and Python format some floats differently
+        if dumps(json.loads(text)) == encoded:
+            return text
+        return encoded
+
+    def __getitem__(self, i):
+        if isinstance(i, int):
+            return self._materialize(i)
+        else:
+            for j in range(len(self.list))[i]:
+                self._materialize(j)
+            return super(LazyListContainer, self).__getitem__(i)
+
+    def __iter__(self):
+        materialize = self._materialize
+        for i, item in enumerate(self.list):
+            yield materialize(i) if type(item) == str else item
+
+    def __reversed__(self):
+        for i in reversed(range(len(self.list))):
+            yield self._materialize(i)
+
+    def __repr__(self):
+        return 'ListContainer({})'.format(' '.join(repr(x) for x in self))
+
+    @property
+    def pending(self):
+        """
+        Number of items that have not yet been decoded
+        """
+        return sum(type(item) == str for item in self.list)
+
+    def to_json(self):
+        return [json.loads(item) if type(item) == str
+                else to_json_wrapper(item) for item in self.list]
+
+
+class SharedListContainer(ListContainer):
+    """
+    ListContainer where the same element can appear in many positions,
+    as returned by :func:`.load` with ``share_empty=True``.
+
+    These elements can't store where they are, so the container sets
+    the ``.parent`` and ``.location`` of every item it reads (and
+    remembers its position for ``.index()``); held references to a
+    shared element refer to the position where it was last read from.
+    **This class shouldn't be instantiated directly by users.**
+    """
+
+    __slots__ = []
+
+    def _locate(self, item, i):
+        item.parent = self.parent
+        item.location = self.location
+        if self.positions is None:
+            self.positions = {}
+        self.positions[id(item)] = i % len(self.list)
+        return item
+
+    def __getitem__(self, i):
+        if isinstance(i, int):
+            return self._locate(self.list[i], i)
+        return super(SharedListContainer, self).__getitem__(i)
+
+    def __iter__(self):
+        locate = self._locate
+        for i, item in enumerate(self.list):
+            yield locate(item, i)
+
+    def __reversed__(self):
+        locate = self._locate
+        for i in reversed(range(len(self.list))):
+            yield locate(self.list[i], i)
+
+
 class DictContainer(MutableMapping):
     """
     Wrapper around a dict, to track the elements' parents.
@@ -126,6 +366,20 @@ class DictContainer(MutableMapping):
         self.update(args)  # Must be a sequence of tuples
         self.update(kwargs)  # Order of kwargs is not preserved
 
+    @classmethod
+    def _new(cls, items, oktypes, parent):
+        """
+        Build a container around an already validated ``OrderedDict``,
+        without copying it or type-checking its values
+        """
+        obj = cls.__new__(cls)
+        obj.dict = items
+        obj.oktypes = oktypes
+        obj.parent = parent
+        obj.location = None
+        _attach_all(items.values(), parent, None)
+        return obj
+
     def __contains__(self, item):
         return item in self.dict
 
@@ -133,14 +387,14 @@ class DictContainer(MutableMapping):
         return len(self.dict)
 
     def __getitem__(self, k):
-        return attach(self.dict[k], self.parent, self.location)
+        return self.dict[k]
 
     def __delitem__(self, k):
         del self.dict[k]
 
     def __setitem__(self, k, v):
         v = check_type(v, self.oktypes)
-        self.dict[k] = v
+        self.dict[k] = attach(v, self.parent, self.location)
 
     def __str__(self):
         return self.__repr__()
@@ -175,6 +429,15 @@ def attach(element, parent, location):
     return element
 
 
+def _attach_all(items, parent, location):
+    """
+    Set the .parent and .location of trusted items (see ``_new()``)
+    """
+    for item in items:
+        item.parent = parent
+        item.location = location
+
+
 def to_json_wrapper(e):
     if isinstance(e, basestring):
         return e
@@ -7,6 +7,7 @@ from collections import OrderedDict
 from .utils import check_type, check_group, encode_dict
 from .containers import ListContainer, DictContainer
 from .base import Element, Block, BlockText, Inline, InlineText, InlineBlock, MetaValue
+from .base import CHILD_TYPES
 from typing import List, Dict, Tuple
 from .constants import *
 
@@ -43,6 +44,9 @@ class Doc(Element):
         >>> doc.figure_count = 0 #  You can add attributes freely
     """
 
+    # Filters can add their own attributes to the document
+    __slots__ = ['_metadata', 'format', 'api_version', '__dict__']
+
     _children = ['metadata', 'content']
 
     def __init__(self, *args: List[Block], metadata: Dict=None, format: str='html', api_version: Tuple[int]=None):
@@ -154,6 +158,7 @@ class LineBreak(Inline):
 class Plain(Block):
     """Plain text, not a paragraph
     """
+    __slots__ = []
 
 
 class Para(Block):
@@ -165,41 +170,50 @@ class Para(Block):
         >>> para1 = Para(*content)
         >>> para2 = Para(Str('More'), Space, Str('words.'))
     """
+    __slots__ = []
 
 
 class BlockQuote(Block):
     """Block quote
     """
+    __slots__ = []
+    child_type = Block
 
 
 class Emph(Inline):
     """Emphasized text
     """
+    __slots__ = []
 
 
 class Strong(Inline):
     """Strongly emphasized text
     """
+    __slots__ = []
 
 
 class Strikeout(Inline):
     """Strikeout text
     """
+    __slots__ = []
 
 
 class Superscript(Inline):
     """Superscripted text (list of inlines)
     """
+    __slots__ = []
 
 
 class Subscript(Inline):
     """Subscripted text (list of inlines)
     """
+    __slots__ = []
 
 
 class SmallCaps(Inline):
     """Small caps text (list of inlines)
     """
+    __slots__ = []
 
 
 class Note(InlineBlock):
@@ -208,11 +222,12 @@ class Note(InlineBlock):
     :param args: elements that are part of the note
     :Base: :class:`Inline`
      """
-    __slots__ = ['_content']
+    __slots__ = []
     _children = ['content']
+    child_type = Block
 
     def __init__(self, *args):
-        super(Note, self).__init__(*args)
+        super(Note, self).__init__()
         self._set_content(args, Block)
 
     def _slots_to_json(self):
@@ -242,7 +257,7 @@ class Header(Block):
         >>> header = Header(*title, level=2, identifier='toc')
         >>> header.level += 1
      """
-    __slots__ = Block.__slots__ + ['level']
+    __slots__ = ['level']
 
     def __init__(self, *args: List[Inline], level: int=1, **kwargs):
         super(Header, self).__init__(*args, **kwargs)
@@ -257,6 +272,7 @@ class Header(Block):
 class Div(Block):
     """Generic block container with attributes
     """
+    __slots__ = []
     child_type = Block
 
     def _slots_to_json(self):
@@ -266,6 +282,7 @@ class Div(Block):
 class Span(InlineBlock):
     """Generic block container with attributes
     """
+    __slots__ = []
 
     def _slots_to_json(self):
         return [self._ica_to_json(), self.content.to_json()]
@@ -275,7 +292,7 @@ class Quoted(Inline):
     """Quoted text
     """
 
-    __slots__ = Inline.__slots__ + ['quote_type']
+    __slots__ = ['quote_type']
 
     def __init__(self, *args: List[Inline], quote_type: str='DoubleQuote'):
         super(Quoted, self).__init__(*args)
@@ -294,10 +311,10 @@ class Cite(Inline):
     """Cite: set of citations with related text
     """
 
-    __slots__ = Inline.__slots__ + ['_citations']
+    __slots__ = ['_citations']
     _children = Inline._children + ['citations']
 
-    def __init__(self, *args: List[Inline], citations: List[Citation]=None):
+    def __init__(self, *args: List[Inline], citations: List['Citation']=None):
         super(Cite, self).__init__(*args)
         self._citations = None
 
@@ -412,8 +429,7 @@ class Link(InlineBlock):
     :Base: :class:`Inline`
      """
 
-    __slots__ = ['_content', 'url', 'title',
-                 'identifier', 'classes', 'attributes']
+    __slots__ = ['url', 'title']
     _children = ['content']
 
     def __init__(self, *args: List[Inline], url: str='', title: str='', **kwargs):
@@ -444,7 +460,7 @@ class Image(InlineBlock):
     :Base: :class:`Inline`
      """
 
-    __slots__ = InlineBlock.__slots__ + ['url', 'title']
+    __slots__ = ['url', 'title']
 
     def __init__(self, *args: List[Inline], url: str='', title: str='', **kwargs):
         super(Image, self).__init__(*args, **kwargs)
@@ -499,7 +515,7 @@ class CodeBlock(Block):
     :Base: :class:`Block`
      """
 
-    __slots__ = Block.__slots__ + ['text']
+    __slots__ = ['text']
     _children = []
 
     def __init__(self, text: str, **kwargs):
@@ -514,14 +530,33 @@ class RawBlock(BlockText):
     """
     Raw block
     """
+    __slots__ = []
     def _slots_to_json(self):
         return [self.format, self.text]
 
 
-class Code(BlockText):
+class Code(Inline):
     """
     Inline code (literal)
+
+    :param text: literal text (preformatted text, code, etc.)
+    :type text: :class:`str`
+    :param identifier: element identifier (usually unique)
+    :type identifier: :class:`str`
+    :param classes: class names of the element
+    :type classes: :class:`list` of :class:`str`
+    :param attributes: additional attributes
+    :type attributes: :class:`dict`
+    :Base: :class:`Inline`
      """
+    __slots__ = ['text', '_classes', '_attributes']
+    _children = []
+
+    def __init__(self, text: str, identifier: str='',
+                 classes: List[str]=None, attributes: Dict=None):
+        super(Inline, self).__init__()
+        self.text = check_type(text, str)
+        self._set_ica(identifier, classes or [], attributes or {})
 
     def _slots_to_json(self):
         ica = self._ica_to_json()
@@ -531,8 +566,10 @@ class Code(BlockText):
 class Math(InlineText):
     """TeX math (literal)
     """
+    __slots__ = []
 
     default_format = 'DisplayMath'
+    formats = MATH_FORMATS
 
     def _slots_to_json(self):
         format = {'t': self.format}
@@ -546,6 +583,7 @@ class Math(InlineText):
 class RawInline(InlineText):
     """Raw inline text
     """
+    __slots__ = []
 
     default_format = 'html'
 
@@ -560,12 +598,18 @@ class RawInline(InlineText):
 class ListItem(Block):
     """List item (contained in bullet lists and ordered lists)
     """
+    __slots__ = []
     child_type = Block
 
+    def to_json(self):
+        # Encoded by pandoc as a list of its items, without a tag
+        return self.content.to_json()
+
 
 class BulletList(Block):
     """Bullet list (unordered list)
     """
+    __slots__ = []
     child_type = ListItem
 
 
@@ -586,7 +630,7 @@ class OrderedList(Block):
      """
     child_type = ListItem
 
-    __slots__ = Block.__slots__ = ['_content', 'start', 'style', 'delimiter']
+    __slots__ = ['start', 'style', 'delimiter']
 
     def __init__(self, *args: List[ListItem], start=1, style='Decimal', delimiter='Period'):
         super(OrderedList, self).__init__(*args)
@@ -613,8 +657,13 @@ class Definition(Block):
 
     :Base: :class:`Element`
      """
+    __slots__ = []
     child_type = Block
 
+    def to_json(self):
+        # Encoded by pandoc as a list of its items, without a tag
+        return self.content.to_json()
+
 
 class DefinitionItem(Element):
     """
@@ -689,6 +738,7 @@ class DefinitionList(Block):
     :param args: Definition items (a term with definitions)
     :Base: :class:`Block`
      """
+    __slots__ = []
 
     child_type = DefinitionItem
 
@@ -699,14 +749,18 @@ class LineItem(Block):
     :param args: Line item
     :Base: :class:`Element`
      """
-    __slots__ = ['_content']
+    __slots__ = []
     _children = ['content']
 
+    def to_json(self):
+        # Encoded by pandoc as a list of its items, without a tag
+        return self.content.to_json()
+
 
 class LineBlock(Block):
     """Line block (sequence of lines)
     """
-    __slots__ = ['_content']
+    __slots__ = []
     _children = ['content']
 
     child_type = LineItem
@@ -719,10 +773,14 @@ class TableCell(Block):
     :param args: elements
     :Base: :class:`Element`
      """
-    __slots__ = ['_content']
+    __slots__ = []
     _children = ['content']
     child_type = Block
 
+    def to_json(self):
+        # Encoded by pandoc as a list of its items, without a tag
+        return self.content.to_json()
+
 
 class TableRow(Block):
     """
@@ -731,10 +789,14 @@ class TableRow(Block):
     :param args: cells
     :Base: :class:`Element`
      """
-    __slots__ = ['_content']
+    __slots__ = []
     _children = ['content']
     child_type = TableCell
 
+    def to_json(self):
+        # Encoded by pandoc as a list of its items, without a tag
+        return self.content.to_json()
+
 
 class Table(Block):
     """Table, made by a list of table rows, and
@@ -763,7 +825,7 @@ class Table(Block):
     :Base: :class:`Block`
      """
 
-    __slots__ = ['_content', '_header', '_caption',
+    __slots__ = ['_header', '_caption',
                  'alignment', 'width', 'rows', 'cols']
     _children = ['header', 'content', 'caption']
     child_type = TableRow
@@ -852,11 +914,11 @@ class MetaList(MetaValue):
     :param args: contents of a metadata list
     :Base: :class:`MetaValue`
     """
-    __slots__ = ['_content']
+    __slots__ = []
     _children = ['content']
 
     def __init__(self, *args: List[MetaValue]):
-        super(MetaList, self).__init__(*args)
+        super(MetaList, self).__init__()
         args = [builtin2meta(v) for v in args]
         self._set_content(args, MetaValue)
 
@@ -881,11 +943,11 @@ class MetaMap(MetaValue):
     :type kwargs: DictContainer[MetaValue]
     :Base: :class:`MetaValue`
     """
-    __slots__ = ['_content']
+    __slots__ = []
     _children = ['content']
 
     def __init__(self, *args: List[MetaValue], **kwargs):
-        super(MetaMap, self).__init__(*args)
+        super(MetaMap, self).__init__()
         args = list(args)
         if kwargs:
             args.extend(kwargs.items())
@@ -933,11 +995,11 @@ class MetaInlines(MetaValue):
 
      """
 
-    __slots__ = ['_content']
+    __slots__ = []
     _children = ['content']
 
     def __init__(self, *args: List[Inline]):
-        super(MetaInlines, self).__init__(*args)
+        super(MetaInlines, self).__init__()
         self._set_content(args, Inline)
 
     def _slots_to_json(self):
@@ -952,11 +1014,11 @@ class MetaBlocks(MetaValue):
     :Base: :class:`MetaValue`
     """
 
-    __slots__ = ['_content']
+    __slots__ = []
     _children = ['content']
 
     def __init__(self, *args: List[Block]):
-        super(MetaBlocks, self).__init__(*args)
+        super(MetaBlocks, self).__init__()
         self._set_content(args, Block)
 
     def _slots_to_json(self):
@@ -1008,6 +1070,66 @@ class MetaBool(MetaValue):
         return self.boolean
 
 
+# ---------------------------
+# Constants
+# ---------------------------
+# Elements without content (defined here instead of in constants.py,
+# which is imported by this module)
+
+EMPTY_ELEMENTS = {Null, Space, HorizontalRule, SoftBreak, LineBreak}
+
+# Empty elements without attributes, which load(..., share_empty=True)
+# can use a single instance for (unlike Null and HorizontalRule, which
+# can be given an identifier, classes or attributes)
+SHARED_ELEMENTS = {Space, SoftBreak, LineBreak}
+
+
+# ---------------------------
+# Containment
+# ---------------------------
+# Element types that each element type can contain directly; used by
+# Element.walk(types=...) to skip subtrees that can't contain an element
+# of the requested types
+
+_inlines = (Str, Space, SoftBreak, LineBreak, Emph, Strong, Strikeout,
+            Superscript, Subscript, SmallCaps, Quoted, Cite, Code, Math,
+            RawInline, Link, Image, Note, Span)
+
+_blocks = (Null, HorizontalRule, Plain, Para, BlockQuote, Header, Div,
+           CodeBlock, RawBlock, BulletList, OrderedList, DefinitionList,
+           LineBlock, Table)
+
+_metavalues = (MetaList, MetaMap, MetaInlines, MetaBlocks, MetaString,
+               MetaBool)
+
+CHILD_TYPES.update(dict.fromkeys(
+    (Str, Space, SoftBreak, LineBreak, Code, Math, RawInline, Null,
+     HorizontalRule, CodeBlock, RawBlock, MetaString, MetaBool), ()))
+
+CHILD_TYPES.update(dict.fromkeys(
+    (Emph, Strong, Strikeout, Superscript, Subscript, SmallCaps, Quoted,
+     Link, Image, Span, Plain, Para, Header, LineItem, Citation,
+     MetaInlines), _inlines))
+
+CHILD_TYPES.update(dict.fromkeys(
+    (Note, BlockQuote, Div, ListItem, Definition, TableCell, MetaBlocks),
+    _blocks))
+
+CHILD_TYPES.update({
+    Doc: _blocks + (MetaMap,),
+    Cite: _inlines + (Citation,),
+    BulletList: (ListItem,),
+    OrderedList: (ListItem,),
+    DefinitionList: (DefinitionItem,),
+    DefinitionItem: _inlines + (Definition,),
+    LineBlock: (LineItem,),
+    Table: _inlines + (TableRow,),
+    TableRow: (TableCell,),
+    MetaList: _metavalues,
+    MetaMap: _metavalues,
+})
+
+
 # ---------------------------
 # Functions
 # ---------------------------
@@ -1039,10 +1161,27 @@ def _decode_row(row):
     return TableRow(*row)
 
 
-def from_json(data):
+def from_json(data, validate=True):
+    """
+    Hook used by ``json.load(..., object_pairs_hook=from_json)``
+
+    With ``validate=False`` the elements are built directly from the
+    decoded JSON (see :meth:`.Element._new`), skipping the type checks of
+    their constructors; only use it with well-formed input such as the
+    output of Pandoc.
+    """
+
+    registry = _res_func if validate else _res_func_trusted
+
+    # Fast path: pandoc encodes every element as [("t", tag), ("c", content)]
+    # (in that order), so we can avoid building an OrderedDict for each one
+    if data and data[0][0] == 't' and len(data) <= 2:
+        tag = data[0][1]
+        if len(data) == 1:
+            return _decode_element(tag, None, registry)
+        elif data[1][0] == 'c':
+            return _decode_element(tag, data[1][1], registry)
 
-    # OrderedDict should be fast in 3.6+, so don't worry about speed:
-    # https://twitter.com/raymondh/status/773978885092323328
     data = OrderedDict(data)
 
     # Metadata key (legacy)
@@ -1068,103 +1207,218 @@ def from_json(data):
     # - New API: ('t', 'Space')
     # - Old API: ('t', 'Space'), ('c', [])
     assert (len(data) == 1) or (len(data) == 2 and 'c' in data)
-    tag = data['t']
-    c = data.get('c')
-
-    # Maybe using globals() is too slow?
-    # TODO: Try w/out globals, as json.load() is a bit slow
-
-    if tag == 'Str':
-        return Str(c)
-
-    elif tag in ('Null', 'Space', 'HorizontalRule', 'SoftBreak', 'LineBreak'):
-        return globals()[tag]()
-
-    elif tag in ('Plain', 'Para', 'BlockQuote', 'Emph', 'Strong', 'Strikeout',
-                 'Superscript', 'Subscript', 'SmallCaps', 'Note'):
-        return globals()[tag](*c)
-
-    elif tag in ('Div', 'Span'):
-        return globals()[tag](*c[1], **_decode_ica(c[0]))
-
-    elif tag == 'Header':
-        return Header(*c[2], level=c[0], **_decode_ica(c[1]))
-
-    elif tag == 'Quoted':
-        return Quoted(*c[1], quote_type=c[0])
-
-    elif tag == 'Link':
-        return Link(*c[1], url=c[2][0], title=c[2][1], **_decode_ica(c[0]))
-
-    elif tag == 'Image':
-        return Image(*c[1], url=c[2][0], title=c[2][1], **_decode_ica(c[0]))
-
-    elif tag == 'CodeBlock':
-        return CodeBlock(text=c[1], **_decode_ica(c[0]))
+    return _decode_element(data['t'], data.get('c'), registry)
 
-    elif tag == 'RawBlock':
-        return RawBlock(text=c[1], format=c[0])
 
-    elif tag == 'Code':
-        return Code(text=c[1], **_decode_ica(c[0]))
-
-    elif tag == 'Math':
-        return Math(text=c[1], format=c[0])
-
-    elif tag == 'RawInline':
-        return RawInline(text=c[1], format=c[0])
-
-    elif tag == 'Cite':
-        items = [_decode_citation(dct) for dct in c[0]]
-        return Cite(*c[1], citations=items)
-
-    elif tag == 'BulletList':
-        items = [ListItem(*item) for item in c]
-        return BulletList(*items)
-
-    elif tag == 'OrderedList':
-        items = [ListItem(*item) for item in c[1]]
-        return OrderedList(*items, start=c[0][0],
-                           style=c[0][1], delimiter=c[0][2])
+def _decode_element(tag, c, registry):
+    try:
+        decoder = registry[tag]
+    except KeyError:
+        if tag in SPECIAL_ELEMENTS:
+            return tag
+        raise Exception('unknown tag: ' + tag)
+    return decoder(c)
+
+
+def _decode_meta_bool(c):
+    assert c in {True, False}, c
+    return MetaBool(c)
+
+
+# Tag -> constructor registry used by from_json(); each function receives
+# the "c" field of the JSON object (None if missing, [] in the legacy API)
+_res_func = {
+    # Empty elements
+    'Null': lambda c: Null(),
+    'Space': lambda c: Space(),
+    'HorizontalRule': lambda c: HorizontalRule(),
+    'SoftBreak': lambda c: SoftBreak(),
+    'LineBreak': lambda c: LineBreak(),
+
+    # Simple containers
+    'Plain': lambda c: Plain(*c),
+    'Para': lambda c: Para(*c),
+    'BlockQuote': lambda c: BlockQuote(*c),
+    'Emph': lambda c: Emph(*c),
+    'Strong': lambda c: Strong(*c),
+    'Strikeout': lambda c: Strikeout(*c),
+    'Superscript': lambda c: Superscript(*c),
+    'Subscript': lambda c: Subscript(*c),
+    'SmallCaps': lambda c: SmallCaps(*c),
+    'Note': lambda c: Note(*c),
+
+    # Complex containers
+    'Div': lambda c: Div(*c[1], **_decode_ica(c[0])),
+    'Span': lambda c: Span(*c[1], **_decode_ica(c[0])),
+    'Header': lambda c: Header(*c[2], level=c[0], **_decode_ica(c[1])),
+    'Quoted': lambda c: Quoted(*c[1], quote_type=c[0]),
+    'Link': lambda c: Link(*c[1], url=c[2][0], title=c[2][1],
+                           **_decode_ica(c[0])),
+    'Image': lambda c: Image(*c[1], url=c[2][0], title=c[2][1],
+                             **_decode_ica(c[0])),
+    'Cite': lambda c: Cite(*c[1],
+                           citations=[_decode_citation(x) for x in c[0]]),
+
+    # Text
+    'Str': lambda c: Str(c),
+    'CodeBlock': lambda c: CodeBlock(text=c[1], **_decode_ica(c[0])),
+    'RawBlock': lambda c: RawBlock(text=c[1], format=c[0]),
+    'Code': lambda c: Code(text=c[1], **_decode_ica(c[0])),
+    'Math': lambda c: Math(text=c[1], format=c[0]),
+    'RawInline': lambda c: RawInline(text=c[1], format=c[0]),
+
+    # Lists
+    'BulletList': lambda c: BulletList(*[ListItem(*x) for x in c]),
+    'OrderedList': lambda c: OrderedList(*[ListItem(*x) for x in c[1]],
+                                         start=c[0][0], style=c[0][1],
+                                         delimiter=c[0][2]),
+    'DefinitionList': lambda c: DefinitionList(
+        *[_decode_definition_item(x) for x in c]),
+    'LineBlock': lambda c: LineBlock(*[LineItem(*x) for x in c]),
+
+    # Tables
+    'Table': lambda c: Table(*[_decode_row(x) for x in c[4]],
+                             caption=c[0], alignment=c[1], width=c[2],
+                             header=_decode_row(c[3])),
+
+    # Metadata
+    'MetaList': lambda c: MetaList(*c),
+    'MetaMap': lambda c: MetaMap(*c.items()),
+    'MetaInlines': lambda c: MetaInlines(*c),
+    'MetaBlocks': lambda c: MetaBlocks(*c),
+    'MetaString': lambda c: MetaString(c),
+    'MetaBool': _decode_meta_bool,
+}
 
-    elif tag == 'DefinitionList':
-        items = [_decode_definition_item(item) for item in c]
-        return DefinitionList(*items)
 
-    elif tag == 'LineBlock':
-        items = [LineItem(*item) for item in c]
-        return LineBlock(*items)
+# ---------------------------
+# Trusted decoders (used by from_json with validate=False)
+# ---------------------------
+# These mirror the attributes set by each constructor, but take the
+# JSON lists as-is instead of copying and type-checking every item
 
-    elif tag == 'Table':
-        header = _decode_row(c[3])
-        data = [_decode_row(x) for x in c[4]]
-        return Table(*data, caption=c[0], alignment=c[1], width=c[2],
-                     header=header)
+def _new_block(cls, content, **kwargs):
+    return cls._new(content, identifier='', _classes=None,
+                    _attributes=None, **kwargs)
 
-    elif tag == 'MetaList':
-        return MetaList(*c)
 
-    elif tag == 'MetaMap':
-        return MetaMap(*c.items())
+def _new_ica_block(cls, content, ica, **kwargs):
+    return cls._new(content, identifier=ica[0], _classes=ica[1] or None,
+                    _attributes=ica[2] or None, **kwargs)
 
-    elif tag == 'MetaInlines':
-        return MetaInlines(*c)
 
-    elif tag == 'MetaBlocks':
-        return MetaBlocks(*c)
+def _new_citation(dct):
+    dct = dict(dct)
+    citation = Citation._new(identifier=dct['citationId'],
+                             id=dct['citationId'],
+                             mode=dct['citationMode'],
+                             hash=dct['citationHash'],
+                             note_num=dct['citationNoteNum'])
+    citation._prefix = ListContainer._new(dct['citationPrefix'], Inline,
+                                          citation, 'prefix')
+    citation._suffix = ListContainer._new(dct['citationSuffix'], Inline,
+                                          citation, 'suffix')
+    return citation
 
-    elif tag == 'MetaString':
-        return MetaString(c)
 
-    elif tag == 'MetaBool':
-        assert c in {True, False}, c
-        return MetaBool(c)
+def _new_cite(c):
+    cite = Cite._new(c[1])
+    citations = [_new_citation(x) for x in c[0]]
+    cite._citations = ListContainer._new(citations, Citation,
+                                         cite, 'citations')
+    return cite
 
-    elif tag in SPECIAL_ELEMENTS:
-        return tag
 
-    else:
-        raise Exception('unknown tag: ' + tag)
+def _new_definition_item(item):
+    term, definitions = item
+    definitions = [_new_block(Definition, x) for x in definitions]
+    elem = DefinitionItem._new()
+    elem._term = ListContainer._new(term, Inline, elem, 'term')
+    elem._definitions = ListContainer._new(definitions, Definition,
+                                           elem, 'definitions')
+    return elem
+
+
+def _new_row(row):
+    return _new_block(TableRow, [_new_block(TableCell, x) for x in row])
+
+
+def _new_table(c):
+    rows = [_new_row(x) for x in c[4]]
+    table = _new_block(Table, rows, alignment=c[1], width=c[2],
+                       rows=len(rows), cols=len(c[1]))
+    table._header = _new_row(c[3])
+    table._caption = ListContainer._new(c[0], Inline, table, 'caption')
+    return table
+
+
+def _new_meta_map(c):
+    elem = MetaMap._new()
+    elem._content = DictContainer._new(c, MetaValue, elem)
+    return elem
+
+
+_res_func_trusted = {
+    # Empty elements
+    'Null': lambda c: _new_block(Null, []),
+    'Space': lambda c: Space._new([]),
+    'HorizontalRule': lambda c: _new_block(HorizontalRule, []),
+    'SoftBreak': lambda c: SoftBreak._new([]),
+    'LineBreak': lambda c: LineBreak._new([]),
+
+    # Simple containers
+    'Plain': lambda c: _new_block(Plain, c),
+    'Para': lambda c: _new_block(Para, c),
+    'BlockQuote': lambda c: _new_block(BlockQuote, c),
+    'Emph': lambda c: Emph._new(c),
+    'Strong': lambda c: Strong._new(c),
+    'Strikeout': lambda c: Strikeout._new(c),
+    'Superscript': lambda c: Superscript._new(c),
+    'Subscript': lambda c: Subscript._new(c),
+    'SmallCaps': lambda c: SmallCaps._new(c),
+    'Note': lambda c: Note._new(c, oktypes=Block),
+
+    # Complex containers
+    'Div': lambda c: _new_ica_block(Div, c[1], c[0]),
+    'Span': lambda c: _new_ica_block(Span, c[1], c[0]),
+    'Header': lambda c: _new_ica_block(Header, c[2], c[1], level=c[0]),
+    'Quoted': lambda c: Quoted._new(c[1], quote_type=c[0]),
+    'Link': lambda c: _new_ica_block(Link, c[1], c[0],
+                                     url=c[2][0], title=c[2][1]),
+    'Image': lambda c: _new_ica_block(Image, c[1], c[0],
+                                      url=c[2][0], title=c[2][1]),
+    'Cite': _new_cite,
+
+    # Text
+    'Str': lambda c: Str._new([], text=c),
+    'CodeBlock': lambda c: _new_ica_block(CodeBlock, [], c[0], text=c[1]),
+    'RawBlock': lambda c: _new_block(RawBlock, [], text=c[1], format=c[0]),
+    'Code': lambda c: _new_ica_block(Code, [], c[0], text=c[1]),
+    'Math': lambda c: Math._new(text=c[1], format=c[0]),
+    'RawInline': lambda c: RawInline._new(text=c[1], format=c[0]),
+
+    # Lists
+    'BulletList': lambda c: _new_block(
+        BulletList, [_new_block(ListItem, x) for x in c]),
+    'OrderedList': lambda c: _new_block(
+        OrderedList, [_new_block(ListItem, x) for x in c[1]],
+        start=c[0][0], style=c[0][1], delimiter=c[0][2]),
+    'DefinitionList': lambda c: _new_block(
+        DefinitionList, [_new_definition_item(x) for x in c]),
+    'LineBlock': lambda c: _new_block(
+        LineBlock, [_new_block(LineItem, x) for x in c]),
+
+    # Tables
+    'Table': _new_table,
+
+    # Metadata
+    'MetaList': lambda c: MetaList._new(c, oktypes=MetaValue),
+    'MetaMap': _new_meta_map,
+    'MetaInlines': lambda c: MetaInlines._new(c, oktypes=Inline),
+    'MetaBlocks': lambda c: MetaBlocks._new(c, oktypes=Block),
+    'MetaString': lambda c: MetaString._new(text=c),
+    'MetaBool': lambda c: MetaBool._new(boolean=c),
+}
 
 
 def builtin2meta(val):
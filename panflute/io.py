@@ -2,18 +2,26 @@
 # Imports
 # ---------------------------
 
-from .elements import Element, Doc, from_json, ListContainer
+from .elements import (Element, Block, Doc, from_json, ListContainer,
+                       LineBlock, LineItem, DefinitionList, DefinitionItem,
+                       Cite)
+from .containers import (LazyListContainer, SharedListContainer,
+                         DictContainer)
+from .backends import get_json_backend
+from .profiler import active_profiler, timed
 
 # These will get modified if using Pandoc legacy (<1.8)
 from .elements import (Citation, Table, OrderedList, Quoted,
-                       Math, EMPTY_ELEMENTS)
+                       Math, EMPTY_ELEMENTS, SHARED_ELEMENTS)
 
 import io
 import sys
 import json
 import codecs  # Used in sys.stdout writer
+from json.decoder import WHITESPACE
 from collections import OrderedDict
 from functools import partial
+from itertools import chain
 
 py2 = sys.version_info[0] == 2
 
@@ -22,7 +30,7 @@ py2 = sys.version_info[0] == 2
 # Functions
 # ---------------------------
 
-def load(input_stream=None):
+def load(input_stream=None, validate=True, lazy=False, share_empty=False):
     """
     Load JSON-encoded document and return a :class:`.Doc` element.
 
@@ -45,6 +53,36 @@ def load(input_stream=None):
 
     :param input_stream: text stream used as input
         (default is :data:`sys.stdin`)
+    :param validate: if False, trust the input (usually the output of
+        Pandoc) and build the elements without type-checking them,
+        which is considerably faster for large documents
+        (default is True)
+    :type validate: :class:`bool`
+    :param lazy: if True, the top-level blocks of the document are kept
+        as JSON strings and only converted into elements when they are
+        first accessed (e.g. with ``doc.content[i]`` or ``doc.walk()``);
+        the blocks that are never accessed or modified are written back
+        verbatim by :func:`.dump`, as are the decoded blocks that are
+        encoded the same as before. Loading is then more than ten times
+        faster, but all the decoded blocks are still encoded when
+        dumping, and finding where each block ends has a small cost
+        that is paid again when it's decoded: loading, walking all of
+        the document and dumping it takes about as long as with
+        ``lazy=False`` (for ``tests/input/portugal``), so it only helps
+        when most blocks aren't accessed (default is False)
+    :type lazy: :class:`bool`
+    :param share_empty: if True, all the :class:`.Space`,
+        :class:`.SoftBreak` and :class:`.LineBreak` elements of the
+        document (see ``SHARED_ELEMENTS``) are one instance per type.
+        Their ``.parent`` and ``.location`` (and thus ``.index``,
+        ``.next``, etc.) are set by their container every time they are
+        read, so they refer to the position where they were last read
+        from. This only saves about a tenth of the memory of a document
+        (2 MB out of 20 MB for ``tests/input/portugal``), and finding the
+        containers that hold them makes loading slower (by up to a
+        third with ``validate=False``), so only use it when memory is
+        tight (default is False)
+    :type share_empty: :class:`bool`
     :rtype: :class:`.Doc`
     """
 
@@ -55,11 +93,19 @@ def load(input_stream=None):
             input_stream = io.open(sys.stdin.fileno())
 
     # Load JSON and validate it
-    doc = json.load(input_stream, object_pairs_hook=from_json)
+    hook = from_json if validate else partial(from_json, validate=False)
+    if share_empty:
+        hook = _sharing_hook(hook)
+    backend = get_json_backend()
+    if lazy:
+        doc = _load_lazy(input_stream.read(), hook, backend)
+    else:
+        doc = backend.decode(input_stream.read(), hook)
 
     # Notes:
     # - We use 'object_pairs_hook' instead of 'object_hook' to preserve the
-    #   order of the metadata.
+    #   order of the metadata (JSON backends other than the standard library
+    #   parse into plain dicts first, and then call the hook on their items).
     # - The hook gets called for dicts (not lists), and the deepest dicts
     #   get called first (so you can ensure that when you receive a dict,
     #   its contents have already been fed to the hook).
@@ -95,6 +141,136 @@ def load(input_stream=None):
     return doc
 
 
+def _sharing_hook(hook):
+    """
+    Wrap a JSON hook so it returns shared instances of the
+    ``SHARED_ELEMENTS`` (new ones for each document) instead of creating
+    new ones, and puts them in containers that locate them when read
+    """
+    shared = {cls.__name__: cls() for cls in SHARED_ELEMENTS}
+
+    def from_json_shared(data):
+        # Pandoc encodes empty elements as [("t", tag)]; or as
+        # [("t", tag), ("c", [])] before pandoc 1.18
+        if data and data[0][0] == 't' and \
+                (len(data) == 1 or len(data) == 2 and data[1][1] == []):
+            elem = shared.get(data[0][1])
+            if elem is not None:
+                return elem
+        elem = hook(data)
+        if isinstance(elem, Element):
+            _share_containers(elem)
+        return elem
+    return from_json_shared
+
+
+def _share_containers(elem):
+    """
+    Turn the containers of an element that hold shared elements into
+    SharedListContainers, including those of the line items, definition
+    items and citations built by its decoder (which aren't JSON objects,
+    so they don't go through the hook)
+    """
+    nested = type(elem) in (LineBlock, DefinitionList, Cite)
+    for child in elem._children:
+        obj = getattr(elem, child)
+        if type(obj) is not ListContainer:
+            continue
+        if not _shared_types.isdisjoint(map(type, obj.list)):
+            obj.__class__ = SharedListContainer
+        if nested:
+            for item in obj.list:
+                if type(item) in (LineItem, DefinitionItem, Citation):
+                    _share_containers(item)
+
+
+_shared_types = frozenset(SHARED_ELEMENTS)
+
+
+def _load_lazy(raw, hook, backend):
+    """
+    Decode a JSON-encoded document, except for its top-level blocks,
+    which are kept as JSON strings inside a :class:`.LazyListContainer`
+    """
+    decode = json.JSONDecoder(object_pairs_hook=hook).raw_decode
+    # Only used to find where blocks end: object_pairs_hook=len throws
+    # each JSON object away as soon as it's parsed, instead of building
+    # dicts for the whole block (which made skipping 3-4x slower)
+    skip = json.JSONDecoder(object_pairs_hook=len).raw_decode
+    ws = WHITESPACE.match
+
+    def expect(char, i):
+        i = ws(raw, i).end()
+        if raw[i:i + 1] != char:
+            raise ValueError('Expecting {!r}: char {}'.format(char, i))
+        return ws(raw, i + 1).end()
+
+    def scan_blocks(i):
+        blocks = []
+        i = expect('[', i)
+        while raw[i:i + 1] != ']':
+            if blocks:
+                i = expect(',', i)
+            _, end = skip(raw, i)
+            blocks.append(raw[i:end])
+            i = ws(raw, end).end()
+        return blocks, i + 1
+
+    i = ws(raw).end()
+    if raw[i:i + 1] == '[':
+        # Legacy Pandoc: [{"unMeta":{META}},[BLOCKS]]
+        i = expect('[', i)
+        metadata, i = decode(raw, i)
+        i = expect(',', i)
+        blocks, i = scan_blocks(i)
+        expect(']', i)
+        doc = Doc(metadata=metadata)
+    else:
+        # Modern Pandoc: {"pandoc-api-version":[..],"meta":{..},"blocks":[..]}
+        fields = {}
+        i = expect('{', i)
+        while raw[i:i + 1] != '}':
+            if fields:
+                i = expect(',', i)
+            key, i = skip(raw, i)
+            i = expect(':', i)
+            if key == 'blocks':
+                fields[key], i = scan_blocks(i)
+            else:
+                fields[key], i = decode(raw, i)
+            i = ws(raw, i).end()
+        doc = Doc(metadata=fields['meta'],
+                  api_version=fields['pandoc-api-version'])
+        blocks = fields['blocks']
+
+    decode_block = partial(backend.decode, hook=hook)
+    doc._content = LazyListContainer._new(blocks, Block, doc,
+                                          decode=decode_block)
+    return doc
+
+
+def _dumps_lazy(doc, dumps):
+    """
+    Serialize a document loaded with ``lazy=True``, writing the blocks that
+    were never decoded or modified exactly as they were received
+    """
+    content = doc.content
+    blocks = []
+    for item in content.list:
+        if type(item) != str:
+            item = content.get_raw(item, dumps)
+        blocks.append(item)
+    blocks = ','.join(blocks)
+    meta = dumps(doc.metadata.content.to_json())
+
+    if doc.api_version is None:
+        return '[{"unMeta":' + meta + '},[' + blocks + ']]'
+    else:
+        api = dumps(doc.api_version)
+        return ('{"pandoc-api-version":' + api + ',"meta":' + meta +
+                ',"blocks":[' + blocks + ']}')
+
+
 def dump(doc, output_stream=None):
     """
     Dump a :class:`.Doc` object into a JSON-encoded text string.
@@ -151,15 +327,12 @@ def dump(doc, output_stream=None):
             E.backup = E.to_json
             E.to_json = Element.to_json
 
-    json_serializer = lambda elem: elem.to_json()
+    dumps = get_json_backend().dumps
 
-    output_stream.write(json.dumps(
-        obj=doc,
-        default=json_serializer,  # Serializer
-        check_circular=False,
-        separators=(',', ':'),  # Compact separators, like Pandoc
-        ensure_ascii=False  # For Pandoc compat
-    ))
+    if isinstance(doc.content, LazyListContainer):
+        output_stream.write(_dumps_lazy(doc, dumps))
+    else:
+        output_stream.write(dumps(doc.to_json()))
 
     # Undo legacy changes
     if doc.api_version is None:
@@ -193,6 +366,7 @@ def run_filters(actions,
                 prepare=None, finalize=None,
                 input_stream=None, output_stream=None,
                 doc=None,
+                fused=False,
                 **kwargs):
     """
     Receive a Pandoc document from the input stream (default is stdin),
@@ -205,6 +379,15 @@ def run_filters(actions,
       this is done through the :func:`.load` and :func:`.dump` functions.
     - It walks through the document once for every function in *actions*,
       so the actions are applied sequentially.
+    - With ``fused=True``, it walks through the document only once instead,
+      applying all the functions in *actions* (in order) to each element,
+      which is faster for long documents. If an action replaces an element,
+      the following actions are applied to the replacement and its new
+      children. But the actions are no longer independent: an action sees
+      the children of an element after all the actions have been applied
+      to them, and the parents and following siblings of the element before
+      the previous actions have visited them. Only use it if the actions
+      don't depend on each other.
     - By default, it will read from stdin and write to stdout,
       but these can be modified.
     - It can also apply functions to the entire document at the beginning and
@@ -227,6 +410,10 @@ def run_filters(actions,
         (default is :data:`sys.stdout`)
     :param doc: ``None`` unless running panflute as a filter, in which case this will be a :class:`.Doc` element
     :type doc: ``None`` | :class:`.Doc`
+    :param fused: apply all the functions in *actions* in a single walk,
+     instead of walking through the document once for every function
+     (default is False)
+    :type fused: :class:`bool`
     :param \*kwargs: keyword arguments will be passed through to the *action*
      functions (so they can actually receive more than just two arguments
      (*element* and *doc*)
@@ -240,11 +427,31 @@ def run_filters(actions,
     if prepare is not None:
         prepare(doc)
 
-    for action in actions:
-        if kwargs:
-            action = partial(action, **kwargs)
-        doc = doc.walk(action, doc)
-    
+    types = [_type_tuple(getattr(action, 'types', None)) for action in actions]
+    if kwargs:
+        actions = [partial(action, **kwargs) for action in actions]
+
+    # Count the elements visited by the actions, if profiling filters
+    profiler = active_profiler()
+    walk = Element.walk
+    if profiler is not None:
+        actions = [profiler.wrap(action) for action in actions]
+
+        def walk(*args):
+            ans, seconds = timed(Element.walk, *args)
+            profiler.add_walk(seconds)
+            return ans
+
+    if not fused:
+        for action, action_types in zip(actions, types):
+            doc = walk(doc, action, doc, action_types)
+    elif actions:
+        # Only restrict the walk if every action declared its types
+        all_types = None
+        if None not in types:
+            all_types = tuple(chain.from_iterable(types))
+        doc = walk(doc, _fuse_actions(actions, types), doc, all_types)
+
     if finalize is not None:
         finalize(doc)
 
@@ -254,12 +461,104 @@ def run_filters(actions,
         return(doc)
 
 
-def run_filter(action, *args, **kwargs):
+def _fuse_actions(actions, types):
+    """
+    Combine a list of actions into a single one, that applies them in order
+    until one of them replaces the element.
+
+    ``types`` has the element types of each action (or None).
+    """
+    actions = list(zip(actions, types))
+    if len(actions) == 1 and types[0] is None:
+        return actions[0][0]
+
+    def fused(elem, doc):
+        for i, (action, action_types) in enumerate(actions):
+            if action_types is not None and \
+                    not isinstance(elem, action_types):
+                continue
+            altered = action(elem, doc)
+            if altered is not None and altered is not elem:
+                rest = actions[i + 1:]
+                if rest and altered != []:
+                    altered = _walk_replacement(altered, elem, rest, doc)
+                return altered
+
+    return fused
+
+
+def _walk_replacement(altered, elem, actions, doc):
+    """
+    Apply the remaining actions to the elements that replaced ``elem``,
+    skipping the children of ``elem`` (which have already been visited
+    by all the actions).
+    """
+    visited = set()
+    elem.walk(lambda e, doc: visited.add(id(e)), doc)
+    visited.discard(id(elem))
+    fused = _fuse_actions(*zip(*actions))
+
+    def action(e, doc):
+        if id(e) not in visited:
+            return fused(e, doc)
+
+    if isinstance(altered, list):
+        ans = []
+        for item in altered:
+            item = item.walk(action, doc)
+            ans.extend(item if isinstance(item, list) else [item])
+        return ans
+    else:
+        return altered.walk(action, doc)
+
+
+def run_filter(action, *args, types=None, **kwargs):
     """
      Wapper for :func:`.run_filters`
 
     Receive a Pandoc document from stdin, apply the *action* function to each element, and write it back to stdout.
 
+    If ``types`` is given (a type or tuple of types), the action will only
+    be applied to elements of these types (see :func:`.element_types`).
+
     See :func:`.run_filters`
     """
+    if types is not None:
+        # Use a copy of the function so we don't modify the original one
+        action = element_types(types)(partial(action))
     return run_filters([action], *args, **kwargs)
+
+
+def element_types(*types):
+    """
+    Decorator that declares the element types an action applies to.
+
+    When running the action with :func:`.run_filters`, it will only be
+    called for elements of these types, and the parts of the document
+    that can't contain them will be skipped:
+
+        >>> @element_types(CodeBlock)
+        >>> def action(elem, doc):
+        >>>     elem.text = elem.text.strip()
+
+    :param types: element classes (e.g. :class:`.CodeBlock`, :class:`.Str`),
+        or tuples of them
+    """
+    types = _type_tuple(types)
+
+    def decorator(action):
+        action.types = types
+        return action
+    return decorator
+
+
+def _type_tuple(types):
+    """
+    Return element types (a type, or a tuple of types or tuples) as a
+    flat tuple, or None if ``types`` is None
+    """
+    if types is None:
+        return None
+    elif not isinstance(types, tuple):
+        return (types,)
+    return tuple(chain.from_iterable(_type_tuple(t) for t in types))
@@ -0,0 +1,166 @@
+"""
+Profiler of the filters run from the metadata (see :func:`.autorun_filters`)
+
+It's enabled with the ``panflute-profile`` metadata field, or with the
+``PANFLUTE_PROFILE`` environment variable, and reports for each filter
+the time spent loading and running it, the time spent walking the
+document, and the number of elements visited, replaced and deleted by
+its actions, together with the time spent in :func:`.load` and
+:func:`.dump`.
+
+If the value of the field is ``true`` (or ``1`` for the variable), the
+report is printed to ``stderr``; any other value is the path of a file
+where the report is written as JSON.
+
+When disabled, the only cost is a check done once by every call to
+:func:`.run_filters`.
+"""
+
+# ---------------------------
+# Imports
+# ---------------------------
+
+import os
+import sys
+import json
+from functools import wraps
+from timeit import default_timer
+from collections import OrderedDict
+
+
+# ---------------------------
+# Constants
+# ---------------------------
+
+ENVIRON = 'PANFLUTE_PROFILE'
+METADATA = 'panflute-profile'
+COUNTERS = ('exec_seconds', 'run_seconds', 'walk_seconds', 'walks',
+            'visited', 'replaced', 'deleted')
+
+_active = None  # Profiler used by run_filters() while filters are run
+
+
+# ---------------------------
+# Classes
+# ---------------------------
+
+class FilterProfiler(object):
+    """
+    Collects the timings and counters of the filters run by
+    :func:`.autorun_filters`.
+
+    :param output: path of the JSON output file, or None to print the
+        report to ``stderr``
+    """
+
+    def __init__(self, output=None):
+        self.output = output
+        self.seconds = OrderedDict()  # Time spent in load, dump, etc.
+        self.filters = []
+        self.current = None
+
+    def start_filter(self, name):
+        """
+        Start collecting the counters of a filter
+        """
+        self.current = OrderedDict([('filter', name)])
+        self.current.update((key, 0) for key in COUNTERS)
+        self.filters.append(self.current)
+        return self.current
+
+    def wrap(self, action):
+        """
+        Return a copy of ``action`` that counts the elements it visits,
+        replaces and deletes (keeping its ``types`` attribute)
+        """
+        stats = self.current
+
+        @wraps(action)
+        def counted(elem, doc):
+            stats['visited'] += 1
+            altered = action(elem, doc)
+            if altered is not None and altered is not elem:
+                if altered == []:
+                    stats['deleted'] += 1
+                else:
+                    stats['replaced'] += 1
+            return altered
+
+        return counted
+
+    def add_walk(self, seconds):
+        if self.current is not None:
+            self.current['walk_seconds'] += seconds
+            self.current['walks'] += 1
+
+    def report(self):
+        """
+        Return the timings and counters as a dict
+        """
+        return OrderedDict([('seconds', self.seconds),
+                            ('filters', self.filters)])
+
+    def write(self):
+        """
+        Print the report to ``stderr``, or write it as JSON to
+        :attr:`output`
+        """
+        if self.output is not None:
+            with open(self.output, 'w', encoding='utf-8') as f:
+                json.dump(self.report(), f, indent=2)
+            return
+
+        header = '{:<24} {:>9} {:>9} {:>9} {:>6} {:>9} {:>9} {:>8}'
+        row = '{:<24} {:>9.4f} {:>9.4f} {:>9.4f} {:>6} {:>9} {:>9} {:>8}'
+        print('panflute: profile', file=sys.stderr)
+        print(header.format('filter', 'exec (s)', 'run (s)', 'walk (s)',
+                            'walks', 'visited', 'replaced', 'deleted'),
+              file=sys.stderr)
+        for stats in self.filters:
+            print(row.format(*stats.values()), file=sys.stderr)
+        for key, seconds in self.seconds.items():
+            print('{:<24} {:>9.4f}'.format(key, seconds), file=sys.stderr)
+
+
+# ---------------------------
+# Functions
+# ---------------------------
+
+def get_profiler(doc):
+    """
+    Return a :class:`FilterProfiler` if profiling is enabled by the
+    environment variable or by the metadata of ``doc``, else None
+    """
+    value = os.environ.get(ENVIRON)
+    if value is None:
+        value = doc.get_metadata(METADATA, False)
+    elif value.lower() in ('', '0', 'false', 'no'):
+        value = False
+    elif value.lower() in ('1', 'true', 'yes'):
+        value = True
+
+    if value is True:
+        return FilterProfiler()
+    elif value:
+        return FilterProfiler(output=value)
+
+
+def active_profiler():
+    """
+    Return the profiler of the filters being run, if any
+    """
+    return _active
+
+
+def set_active_profiler(profiler):
+    global _active
+    _active = profiler
+
+
+def timed(func, *args, **kwargs):
+    """
+    Call ``func`` and return its result and the elapsed seconds
+    """
+    start = default_timer()
+    ans = func(*args, **kwargs)
+    return ans, default_timer() - start
@@ -5,6 +5,7 @@
 from .base import Element
 from .elements import *
 from .io import dump
+from .backends import get_json_backend
 
 import io
 import os
@@ -13,6 +14,11 @@ import sys
 import json
 import yaml
 import shlex
+import uuid
+import hashlib
+import atexit
+import threading
+from collections import OrderedDict
 
 # shutil.which: new in version 3.3
 try:
@@ -21,7 +27,6 @@ except ImportError:
     from shutilwhich import which
 
 from subprocess import Popen, PIPE
-from functools import partial
 
 
 py2 = sys.version_info[0] == 2
@@ -36,6 +41,13 @@ HorizontalSpaces = (Space, LineBreak, SoftBreak)
 
 VerticalSpaces = (Para, )
 
+# Folder of the optional on-disk caches (no caching on disk if not set)
+CACHE_ENVIRON = 'PANFLUTE_CACHE_DIR'
+
+# Prefix of the data directory in the output of pandoc --version
+# (the second one is used by Pandoc 3)
+DATA_DIR_PREFIXES = ('Default user data directory: ', 'User data directory: ')
+
 
 # ---------------------------
 # Convenience functions
@@ -188,22 +200,14 @@ def stringify(element, newlines=True):
     :rtype: :class:`str` 
     """
 
-    def attach_str(e, doc, answer):
+    answer = []
+    for e in element.iter():
         if hasattr(e, 'text'):
-            ans = e.text
+            answer.append(e.text)
         elif isinstance(e, HorizontalSpaces):
-            ans = ' '
+            answer.append(' ')
         elif isinstance(e, VerticalSpaces) and newlines:
-            ans = '\n\n'
-        elif type(e) == Citation:
-            ans = ''
-        else:
-            ans = ''
-        answer.append(ans)
-
-    answer = []
-    f = partial(attach_str, answer=answer)
-    element.walk(f)
+            answer.append('\n\n')
     return ''.join(answer)
 
 
@@ -325,11 +329,8 @@ def run_pandoc(text='', args=None):
     if args is None:
         args = []
 
-    pandoc_path = which('pandoc')
-    if pandoc_path is None or not os.path.exists(pandoc_path):
-        raise OSError("Path to pandoc executable does not exists")
-
-    proc = Popen([pandoc_path] + args, stdin=PIPE, stdout=PIPE, stderr=PIPE)
+    pandoc_path = get_pandoc_info().path
+    proc = _start_process([pandoc_path] + args)
     out, err = proc.communicate(input=text.encode('utf-8'))
     exitcode = proc.returncode
     if exitcode != 0:
@@ -337,6 +338,261 @@ def run_pandoc(text='', args=None):
     return out.decode('utf-8')
 
 
+class PandocPool(object):
+    """
+    Pandoc processes started ahead of time, used by :func:`convert_text`.
+
+    Pandoc reads all of its input before converting it, so a process
+    can only convert one text. Instead, once :func:`convert_text` is
+    called more than once with the same arguments, the pool keeps
+    ``size`` processes already started with them and waiting for their
+    input, so the startup time of pandoc overlaps with the previous
+    conversions instead of adding to them. Each call takes one of them,
+    and starts new ones until there are ``size`` again.
+
+    Only conversions from stdin to stdout are pooled: with input files
+    or ``--output`` a process started ahead of time would run the
+    conversion before it is asked to, so :func:`run_pandoc` and
+    :func:`convert_text` with such ``extra_args`` never use the pool.
+
+    The pool is disabled by default, as the idle processes keep running
+    until they are used, replaced by those of more recent arguments, or
+    stopped with :meth:`close` (or when Python exits).
+    Use :func:`set_pandoc_pool` to enable it.
+
+    :param size: number of idle processes kept for each list of
+        arguments (0 disables the pool)
+    :type size: :class:`int`
+    :param max_commands: number of lists of arguments (the most
+        recently used ones) with idle processes
+    :type max_commands: :class:`int`
+    """
+
+    def __init__(self, size=2, max_commands=4):
+        self.size = size
+        self.max_commands = max_commands
+        self._idle = OrderedDict()  # (cwd, args) -> idle processes
+        self._seen = set()  # (cwd, args) used at least once
+        self._lock = threading.Lock()
+
+    def run(self, args, text=''):
+        """
+        Run a command (such as ``[pandoc_path, '--to=json']``) with the
+        given input text, and return its output
+        """
+        proc = self._acquire(args)
+        out, err = proc.communicate(input=text.encode('utf-8'))
+        if proc.returncode != 0:
+            raise IOError(err)
+        return out.decode('utf-8')
+
+    def _acquire(self, args):
+        # Relative paths in the arguments depend on the working directory
+        key = os.getcwd(), tuple(args)
+        stopped = []
+        with self._lock:
+            idle = self._idle.pop(key, [])
+            proc = None
+            while idle and proc is None:
+                proc = idle.pop(0)
+                if proc.poll() is not None:  # Exited while waiting
+                    proc = None
+            if self.size > 0 and key in self._seen:
+                missing = self.size - len(idle)
+                self._idle[key] = idle  # Now the most recently used
+                while len(self._idle) > self.max_commands:
+                    stopped.extend(self._idle.popitem(last=False)[1])
+            else:
+                missing = 0
+                self._seen.add(key)
+                stopped.extend(idle)
+
+        # Processes are started and stopped without holding the lock
+        _stop_processes(stopped)
+        if proc is None:
+            proc = _start_process(args)
+        if missing > 0:
+            self._add_idle(key, [_start_process(args)
+                                 for _ in range(missing)])
+        return proc
+
+    def _add_idle(self, key, procs):
+        # Other threads may have refilled or dropped the idle processes
+        # of these arguments in the meantime
+        with self._lock:
+            idle = self._idle.get(key)
+            if idle is not None:
+                count = max(0, self.size - len(idle))
+                idle.extend(procs[:count])
+                procs = procs[count:]
+        _stop_processes(procs)
+
+    def close(self):
+        """
+        Stop all the idle processes
+        """
+        with self._lock:
+            idle = list(self._idle.values())
+            self._idle.clear()
+        for procs in idle:
+            _stop_processes(procs)
+
+
+def _start_process(args):
+    return Popen(args, stdin=PIPE, stdout=PIPE, stderr=PIPE)
+
+
+def _stop_processes(procs):
+    for proc in procs:
+        proc.kill()
+        proc.communicate()
+
+
+def get_pandoc_pool():
+    """
+    Return the :class:`PandocPool` used by :func:`convert_text`
+    """
+    return _pandoc_pool
+
+
+def set_pandoc_pool(size=2):
+    """
+    Set the number of pandoc processes that :func:`convert_text` keeps
+    started ahead of time for each list of arguments
+    (see :class:`PandocPool`; by default there are none)
+
+    :param size: number of idle processes (0 disables the pool), or
+        a :class:`PandocPool` instance
+    :type size: :class:`int` | :class:`PandocPool`
+    :rtype: :class:`PandocPool`
+    """
+    global _pandoc_pool
+    _pandoc_pool.close()
+    _pandoc_pool = size if isinstance(size, PandocPool) else PandocPool(size)
+    return _pandoc_pool
+
+
+_pandoc_pool = PandocPool(size=0)
+atexit.register(lambda: _pandoc_pool.close())
+
+
+class PandocInfo(object):
+    """
+    Facts about the pandoc executable, each of them found the first time
+    it's needed (use :func:`get_pandoc_info` to get the one in the PATH):
+
+    - ``path``: path of the executable
+    - ``version``: version as a tuple of ints (e.g. ``(2, 9, 2, 1)``)
+    - ``api_version``: version of the API of its JSON output
+      (e.g. ``(1, 20)``), or None for Pandoc 1.17 and earlier
+    - ``data_dir``: default user data directory (None if unknown)
+
+    If the ``PANFLUTE_CACHE_DIR`` environment variable is set, the facts
+    are also saved to a file in that folder, and reused by other
+    processes for as long as the executable is not modified.
+
+    :param path: path of the pandoc executable
+    :type path: :class:`str`
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.mtime = os.stat(path).st_mtime
+        self._facts = self._read_cache()
+
+    @property
+    def version(self):
+        return tuple(self._get('version'))
+
+    @property
+    def api_version(self):
+        api_version = self._get('api_version')
+        return None if api_version is None else tuple(api_version)
+
+    @property
+    def data_dir(self):
+        return self._get('data_dir')
+
+    def _get(self, key):
+        if key not in self._facts:
+            if key == 'api_version':
+                doc = convert_text('', standalone=True)
+                self._facts[key] = doc.api_version
+            else:
+                out = run_pandoc(args=['--version'])
+                self._facts.update(_parse_pandoc_version(out))
+            self._write_cache()
+        return self._facts[key]
+
+    def _cache_file(self):
+        folder = os.environ.get(CACHE_ENVIRON)
+        return os.path.join(folder, 'pandoc-info.json') if folder else None
+
+    def _read_cache(self):
+        fn = self._cache_file()
+        if fn is None:
+            return {}
+        try:
+            with open(fn, encoding='utf-8') as f:
+                facts = json.load(f).get(self.path, {})
+        except (OSError, ValueError):
+            return {}
+        if facts.pop('mtime', None) != self.mtime:
+            return {}  # The executable was replaced
+        return facts
+
+    def _write_cache(self):
+        fn = self._cache_file()
+        if fn is None:
+            return
+        try:
+            with open(fn, encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            data = {}
+        data[self.path] = dict(self._facts, mtime=self.mtime)
+        try:
+            os.makedirs(os.path.dirname(fn), exist_ok=True)
+            tmp = '{}.{}'.format(fn, os.getpid())
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2)
+            os.replace(tmp, fn)
+        except OSError:
+            pass  # The cache is optional
+
+
+def _parse_pandoc_version(out):
+    # Get the version and the data directory from pandoc --version
+    lines = out.splitlines()
+    version = lines[0].split()[-1] if lines else ''
+    data_dir = None
+    for line in lines:
+        for prefix in DATA_DIR_PREFIXES:
+            if line.startswith(prefix):
+                data_dir = line[len(prefix):]
+    return {'version': [int(n) for n in re.findall(r'\d+', version)],
+            'data_dir': data_dir}
+
+
+def get_pandoc_info(refresh=False):
+    """
+    Return the :class:`PandocInfo` of the pandoc executable in the PATH.
+    It's found once per process (or again, if ``refresh`` is True).
+
+    :rtype: :class:`PandocInfo`
+    """
+    global _pandoc_info
+    if _pandoc_info is None or refresh:
+        path = which('pandoc')
+        if path is None or not os.path.exists(path):
+            raise OSError("Path to pandoc executable does not exists")
+        _pandoc_info = PandocInfo(path)
+    return _pandoc_info
+
+
+_pandoc_info = None  # Set by get_pandoc_info()
+
+
 def convert_text(text,
                  input_format='markdown',
                  output_format='panflute',
@@ -381,6 +637,20 @@ def convert_text(text,
     by Kenneth Reitz.
     """
 
+    text, in_fmt, out_fmt, extra_args = _convert_text_args(
+        text, input_format, output_format, standalone, extra_args)
+
+    if _convert_cache is None:
+        out = inner_convert_text(text, in_fmt, out_fmt, extra_args)
+    else:
+        out = _convert_cache.convert(text, in_fmt, out_fmt, extra_args)
+
+    return _convert_text_result(out, output_format, standalone)
+
+
+def _convert_text_args(text, input_format, output_format, standalone,
+                       extra_args):
+    # Return the text and arguments of inner_convert_text()
     if input_format == 'panflute':
 
         # Problem:
@@ -388,9 +658,9 @@ def convert_text(text,
         #  So we wrap-up the list in a Doc, but with what pandoc-api version?
         #  (remember that Pandoc requires a matching api-version!)
         # Workaround: call Pandoc with empty text to get its api-version
+        # (only once, see PandocInfo)
         if not isinstance(text, Doc):
-            tmp_doc = convert_text('', standalone=True)
-            api_version = tmp_doc.api_version
+            api_version = get_pandoc_info().api_version
             if isinstance(text, Element):
                 text = [text]
             text = Doc(*text, api_version=api_version)
@@ -409,10 +679,13 @@ def convert_text(text,
     if standalone:
         extra_args.append('--standalone')
 
-    out = inner_convert_text(text, in_fmt, out_fmt, extra_args)
+    return text, in_fmt, out_fmt, extra_args
+
 
+def _convert_text_result(out, output_format, standalone):
+    # Decode the output of inner_convert_text()
     if output_format == 'panflute':
-        out = json.loads(out, object_pairs_hook=from_json)
+        out = get_json_backend().decode(out, from_json)
 
         if standalone:
             if not isinstance(out, Doc): # Pandoc 1.7.2 and earlier
@@ -427,14 +700,372 @@ def convert_text(text,
     return out
 
 
+def convert_text_many(texts,
+                      input_format='markdown',
+                      output_format='panflute',
+                      extra_args=None):
+    """
+    Convert many fragments of formatted text with a single Pandoc call
+    to read them, instead of one :func:`convert_text` call per fragment.
+    When the output is not 'panflute', a second call writes them all.
+
+    The fragments are joined into one document, separated by paragraphs
+    with a unique sentinel word; the result is split back at them.
+    Because of this, automatic identifiers are unique across all of the
+    fragments. Definitions are not shared between fragments: those that
+    define link references or footnotes (``[id]: ...``, ``[^id]: ...``,
+    ``.. _id:`` or ``.. [id]``) are converted on their own. Most writers
+    number the notes and put them at the end of the document, so
+    fragments with notes are also written on their own. If a fragment
+    doesn't end where it should (e.g. a code block that is never
+    closed), the fragments are converted one by one.
+
+    Example:
+
+        >>> convert_text_many(['*a*', 'b'])
+        [[Para(Emph(Str(a)))], [Para(Str(b))]]
+
+    :param texts: texts that will be converted
+    :type texts: :class:`list` of (:class:`str` | :class:`.Element` | :class:`list` of :class:`.Element`)
+    :param input_format: format of the texts (see :func:`convert_text`)
+    :param output_format: format of the output (see :func:`convert_text`)
+    :param extra_args: extra arguments passed to Pandoc
+    :type extra_args: :class:`list`
+    :rtype: :class:`list` of (:class:`list` | :class:`str`)
+    """
+
+    def convert(text, input_format='panflute'):
+        return convert_text(text, input_format, output_format,
+                            extra_args=extra_args)
+
+    texts = list(texts)
+    ans = [convert(text, input_format)
+           if isinstance(text, basestring) and _DEFINITION.search(text)
+           else None for text in texts]
+    batch = [i for i, out in enumerate(ans) if out is None]
+    if not batch:
+        return ans
+
+    token = _sentinel(texts)
+    if input_format == 'panflute':
+        text = _join_blocks((texts[i].content if isinstance(texts[i], Doc)
+                             else [texts[i]] if isinstance(texts[i], Element)
+                             else texts[i] for i in batch), token)
+    else:
+        text = '\n\n{}\n\n'.format(token).join(texts[i] for i in batch)
+
+    try:
+        blocks = convert_text(text, input_format, extra_args=extra_args)
+    except IOError:  # E.g. formats that can't be concatenated
+        blocks = None
+    parts = None if blocks is None else _split_blocks(blocks, token)
+
+    if parts is None or len(parts) != len(batch):
+        for i in batch:
+            ans[i] = convert(texts[i], input_format)
+        return ans
+
+    if output_format == 'panflute':
+        for i, part in zip(batch, parts):
+            ans[i] = part
+        return ans
+
+    written = []
+    for i, part in zip(batch, parts):
+        if any(block.find_first(Note) is not None for block in part):
+            ans[i] = convert(part)
+        else:
+            written.append((i, part))
+    if written:
+        out = convert(_join_blocks((part for i, part in written), token))
+        outs = _split_lines(out, token)
+        if outs is None or len(outs) != len(written):
+            outs = [convert(part) for i, part in written]
+        for (i, part), out in zip(written, outs):
+            ans[i] = out
+    return ans
+
+
+# Lines that define a link reference or a footnote in Markdown or
+# reStructuredText, which the other fragments of a joined document would see
+_DEFINITION = re.compile(r'^ {0,3}(\[[^\]\n]+\]:|\.\. (_|\[))', re.M)
+
+
+def _sentinel(texts):
+    # A word that no reader will modify, and that is not in the texts
+    while True:
+        token = 'panflute{}'.format(uuid.uuid4().hex)
+        if not any(isinstance(text, basestring) and token in text
+                   for text in texts):
+            return token
+
+
+def _join_blocks(parts, token):
+    blocks = []
+    for i, part in enumerate(parts):
+        if i:
+            blocks.append(Para(Str(token)))
+        blocks.extend(part)
+    return blocks
+
+
+def _split_blocks(blocks, token):
+    # Split a list of blocks at the sentinel paragraphs
+    parts = [[]]
+    for block in blocks:
+        if isinstance(block, (Para, Plain)) and len(block.content) == 1 \
+                and isinstance(block.content[0], Str) \
+                and block.content[0].text == token:
+            parts.append([])
+        else:
+            parts[-1].append(block)
+    return parts
+
+
+def _split_lines(text, token):
+    # Split a text at the lines of the sentinel paragraphs, which can be
+    # wrapped in a tag (such as <p>...</p>); None if they look different
+    pattern = re.compile(r'\s*(<[^<>]*>)?{}(</[^<>]*>)?\s*$'.format(token))
+    parts = [[]]
+    for line in text.split('\n'):
+        if token not in line:
+            parts[-1].append(line)
+        elif pattern.match(line):
+            parts.append([])
+        else:
+            return None
+    return ['\n'.join(lines).strip('\n') for lines in parts]
+
+
 def inner_convert_text(text, input_format, output_format, extra_args):
     # like convert_text(), but does not support 'panflute' input/output
+    args = _pandoc_args(input_format, output_format, extra_args)
+    if _poolable(extra_args):
+        pandoc_path = get_pandoc_info().path
+        out = _pandoc_pool.run([pandoc_path] + args, text)
+    else:
+        out = run_pandoc(text, args)
+    return _pandoc_output(out)
+
+
+def _pandoc_args(input_format, output_format, extra_args):
+    # Arguments of pandoc for inner_convert_text()
     from_arg = '--from={}'.format(input_format)
     to_arg = '--to={}'.format(output_format)
-    args = [from_arg, to_arg] + extra_args
-    out = run_pandoc(text, args)
-    out = "\n".join(out.splitlines())  # Replace \r\n with \n
-    return out
+    return [from_arg, to_arg] + extra_args
+
+
+def _pandoc_output(out):
+    # Output of pandoc for inner_convert_text()
+    return "\n".join(out.splitlines())  # Replace \r\n with \n
+
+
+def _poolable(extra_args):
+    # Only long options, so there are no input files (nor values that
+    # could be mistaken for them), and none that can set files to read
+    # or write (pandoc also accepts unambiguous prefixes of options)
+    for arg in extra_args:
+        name = arg.split('=', 1)[0]
+        if not name.startswith('--') or name == '--' or any(
+                option.startswith(name) for option in _UNPOOLED_OPTIONS):
+            return False
+    return True
+
+
+_UNPOOLED_OPTIONS = ['--output', '--defaults']
+
+
+class ConvertCache(object):
+    """
+    Cache of the results of :func:`convert_text`, keyed on the text, the
+    input and output formats, the extra arguments and the version of
+    pandoc (use :func:`set_convert_cache` to enable it).
+
+    The most recently used results are kept in memory, and optionally
+    as files in a folder that can be shared by many processes and runs,
+    where the least recently used files are deleted once all of them
+    take more than ``max_bytes``.
+
+    The output of pandoc is what is cached, so when the output format
+    is 'panflute' every call still returns new elements, which can be
+    modified without changing the cache.
+
+    :param size: number of results kept in memory
+    :type size: :class:`int`
+    :param folder: folder of the results kept on disk (default is the
+        ``convert`` folder in ``PANFLUTE_CACHE_DIR`` if that environment
+        variable is set, else nothing is kept on disk)
+    :type folder: :class:`str`
+    :param max_bytes: size of the files kept on disk
+    :type max_bytes: :class:`int`
+    """
+
+    def __init__(self, size=256, folder=None, max_bytes=64 * 2 ** 20):
+        if folder is None and os.environ.get(CACHE_ENVIRON):
+            folder = os.path.join(os.environ[CACHE_ENVIRON], 'convert')
+        self.size = size
+        self.folder = folder
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._memory = OrderedDict()  # Key -> output, least recent first
+        self._disk_bytes = None  # Size of the folder, once needed
+        self._lock = threading.Lock()
+
+    def convert(self, text, input_format, output_format, extra_args):
+        """
+        Like :func:`inner_convert_text`, but cached
+        """
+        key = self.key(text, input_format, output_format, extra_args)
+        out = self.get(key)
+        if out is None:
+            out = inner_convert_text(text, input_format, output_format,
+                                     extra_args)
+            self.put(key, out)
+        return out
+
+    def key(self, text, input_format, output_format, extra_args):
+        """
+        Return the hash of the text, formats, arguments and pandoc version
+        """
+        version = get_pandoc_info().version
+        data = json.dumps([text, input_format, output_format,
+                           list(extra_args), version])
+        return hashlib.sha256(data.encode('utf-8')).hexdigest()
+
+    def get(self, key):
+        """
+        Return the cached output for a key, or None
+        """
+        with self._lock:
+            out = self._memory.get(key)
+            if out is not None:
+                self._memory.move_to_end(key)
+        if out is None:
+            out = self._read(key)
+            if out is not None:
+                self._remember(key, out)
+        if out is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return out
+
+    def put(self, key, out):
+        """
+        Cache the output for a key
+        """
+        self._remember(key, out)
+        self._write(key, out)
+
+    def clear(self):
+        """
+        Remove all the results, in memory and on disk
+        """
+        with self._lock:
+            self._memory.clear()
+        for fn in self._files():
+            _remove(fn)
+        self._disk_bytes = None
+
+    def _remember(self, key, out):
+        with self._lock:
+            self._memory[key] = out
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.size:
+                self._memory.popitem(last=False)
+
+    def _read(self, key):
+        if self.folder is None:
+            return None
+        fn = os.path.join(self.folder, key)
+        try:
+            with open(fn, encoding='utf-8', newline='') as f:
+                out = f.read()
+            os.utime(fn)  # Mark as recently used
+        except OSError:
+            return None
+        return out
+
+    def _write(self, key, out):
+        if self.folder is None:
+            return
+        fn = os.path.join(self.folder, key)
+        try:
+            old_size = os.path.getsize(fn)  # Overwritten below
+        except OSError:
+            old_size = 0
+        try:
+            os.makedirs(self.folder, exist_ok=True)
+            tmp = '{}.{}.tmp'.format(fn, os.getpid())
+            with open(tmp, 'w', encoding='utf-8', newline='') as f:
+                f.write(out)
+            os.replace(tmp, fn)
+        except OSError:
+            return  # The cache is optional
+        if self._disk_bytes is None:
+            self._disk_bytes = sum(os.path.getsize(fn)
+                                   for fn in self._files())
+        else:
+            self._disk_bytes += os.path.getsize(fn) - old_size
+        if self._disk_bytes > self.max_bytes:
+            self._evict()
+
+    def _evict(self):
+        # Delete the least recently used files until they take 3/4 of
+        # max_bytes, so this is not repeated after every write
+        files = []
+        for fn in self._files():
+            try:
+                stat = os.stat(fn)
+            except OSError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, fn))
+        files.sort()
+        total = sum(size for _, size, _ in files)
+        for _, size, fn in files:
+            if total <= self.max_bytes * 3 // 4:
+                break
+            _remove(fn)
+            total -= size
+        self._disk_bytes = total
+
+    def _files(self):
+        if self.folder is None or not os.path.isdir(self.folder):
+            return []
+        return [os.path.join(self.folder, fn) for fn in os.listdir(self.folder)
+                if not fn.endswith('.tmp')]
+
+
+def _remove(fn):
+    try:
+        os.remove(fn)
+    except OSError:
+        pass  # Removed by another process
+
+
+def get_convert_cache():
+    """
+    Return the :class:`ConvertCache` used by :func:`convert_text`,
+    or None if results are not cached
+    """
+    return _convert_cache
+
+
+def set_convert_cache(cache=True):
+    """
+    Cache the results of :func:`convert_text` (see :class:`ConvertCache`)
+
+    :param cache: True for a cache with the default options, a
+        :class:`ConvertCache` instance, or None to stop caching
+    :rtype: :class:`ConvertCache`
+    """
+    global _convert_cache
+    _convert_cache = ConvertCache() if cache is True else cache
+    return _convert_cache
+
+
+_convert_cache = None  # Set by set_convert_cache()
 
 
 # ---------------------------
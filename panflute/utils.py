@@ -14,15 +14,39 @@ from collections import OrderedDict
 # ---------------------------
 
 def check_type(value, oktypes):
+    """
+    Return the value if it is an instance of ``oktypes``, else raise
+    a TypeError. Element classes are also accepted instead of instances
+    (e.g. ``Space`` instead of ``Space()``), and are instantiated.
+    """
+    if isinstance(value, oktypes):
+        return value
+    return _check_type_slow(value, oktypes)
+
+
+def _check_type_slow(value, oktypes):
     # This allows 'Space' instead of 'Space()'
     if callable(value):
         value = value()
-    if not issubclass(value, oktypes):
-        tag = type(value).__name__
-        msg = 'received {} but expected {}'.format(tag, oktypes)
-        raise TypeError(msg)
-    else:
-        return value
+        if isinstance(value, oktypes):
+            return value
+
+    tag = type(value).__name__
+    msg = 'received {} but expected {}'.format(tag, oktypes)
+    raise TypeError(msg)
+
+
+def check_types(values, oktypes):
+    """
+    Like check_type() but for a sequence of values, returned as a list;
+    the types are checked once for each distinct type instead of once
+    for each value
+    """
+    values = list(values)
+    for cls in set(map(type, values)):
+        if not issubclass(cls, oktypes):
+            return [check_type(value, oktypes) for value in values]
+    return values
 
 
 def check_group(value, group):
@@ -105,6 +105,7 @@ setup(
     extras_require={
     #    'dev': ['check-manifest'],
         'test': ['pandocfilters', 'pypandoc', 'configparser', 'pytest-cov'],
+        'fast': ['orjson'],
     },
 
     # If there are data files included in your packages that need to be
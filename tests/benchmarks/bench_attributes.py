@@ -0,0 +1,53 @@
+"""
+Measure the memory used by the documents in tests/input/*/benchmark.json
+with the compact storage of classes and attributes (as loaded), and
+after accessing the .classes and .attributes of every element (which
+builds a list and an OrderedDict for each one, as panflute used to do
+for every element), as measured by tracemalloc
+
+Usage (from the root folder):
+
+    python tests/benchmarks/bench_attributes.py
+"""
+
+import io
+import glob
+import tracemalloc
+import panflute as pf
+
+
+def traced():
+    size, peak = tracemalloc.get_traced_memory()
+    blocks = sum(stat.count for stat in
+                 tracemalloc.take_snapshot().statistics('filename'))
+    return size, blocks
+
+
+def run():
+    fns = sorted(glob.glob('./tests/input/*/benchmark.json'))
+    print('{:<40} {:<9} {:>9} {:>12} {:>10} {:>12} {:>10}'.format(
+        'file', 'validate', 'elements', 'compact KiB', 'blocks', 'expanded KiB',
+        'blocks'))
+
+    for fn in fns:
+        with open(fn, encoding='utf-8') as f:
+            raw = f.read()
+        for validate in (True, False):
+            tracemalloc.start()
+            doc = pf.load(io.StringIO(raw), validate=validate)
+            size, blocks = traced()
+            n = 0
+            for elem in doc.iter():
+                if hasattr(elem, '_classes'):
+                    elem.classes, elem.attributes
+                    n += 1
+            expanded_size, expanded_blocks = traced()
+            tracemalloc.stop()
+            del doc
+            print('{:<40} {:<9} {:>9} {:>12.1f} {:>10} {:>12.1f} {:>10}'.format(
+                fn, str(validate), n, size / 1024, blocks,
+                expanded_size / 1024, expanded_blocks))
+
+
+if __name__ == "__main__":
+    run()
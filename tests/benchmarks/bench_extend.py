@@ -0,0 +1,56 @@
+"""
+Build large bullet lists and tables by adding items with
+ListContainer.extend(), against appending them one at a time
+(how extend() worked when it was inherited from MutableSequence)
+
+Usage (from the root folder):
+
+    python tests/benchmarks/bench_extend.py [repeat]
+"""
+
+import sys
+import timeit
+import panflute as pf
+
+
+def make_items(n):
+    return [pf.ListItem(pf.Plain(pf.Str(str(i)))) for i in range(n)]
+
+
+def make_rows(n):
+    return [pf.TableRow(pf.TableCell(pf.Plain(pf.Str(str(i)))),
+                        pf.TableCell())
+            for i in range(n)]
+
+
+def empty_table():
+    return pf.Table(pf.TableRow(pf.TableCell(), pf.TableCell()))
+
+
+def extend(container, items):
+    container.extend(items)
+
+
+def append(container, items):
+    for item in items:
+        container.append(item)
+
+
+def run(repeat=5):
+    print('{:<14} {:<8} {:>8} {:>10} {:>10}'.format(
+        'document', 'function', 'items', 'time (s)', 'us/item'))
+
+    for n in (1000, 10000, 100000):
+        for name, builder, items in (
+                ('bullet list', pf.BulletList, make_items(n)),
+                ('table', empty_table, make_rows(n))):
+            for f in (extend, append):
+                t = min(timeit.repeat(lambda: f(builder().content, items),
+                                      number=1, repeat=repeat))
+                print('{:<14} {:<8} {:>8} {:>10.4f} {:>10.2f}'.format(
+                    name, f.__name__, n, t, t / n * 1e6))
+
+
+if __name__ == "__main__":
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    run(repeat)
@@ -0,0 +1,72 @@
+"""
+Compare stringify() and Doc.get_metadata(), which are based on the
+read-only Element.iter(), against the previous stringify() that used
+Element.walk(), on the documents in tests/input/*/benchmark.json
+
+For each document it reports the best time and the peak memory allocated
+(as measured by tracemalloc) by each version.
+
+Usage (from the root folder):
+
+    python tests/benchmarks/bench_iter.py [repeat]
+"""
+
+import sys
+import glob
+import timeit
+import tracemalloc
+from functools import partial
+import panflute as pf
+from panflute.tools import HorizontalSpaces, VerticalSpaces
+
+
+def stringify_walk(element, newlines=True):
+    # stringify() before Element.iter() was available
+    def attach_str(e, doc, answer):
+        if hasattr(e, 'text'):
+            ans = e.text
+        elif isinstance(e, HorizontalSpaces):
+            ans = ' '
+        elif isinstance(e, VerticalSpaces) and newlines:
+            ans = '\n\n'
+        else:
+            ans = ''
+        answer.append(ans)
+
+    answer = []
+    f = partial(attach_str, answer=answer)
+    element.walk(f)
+    return ''.join(answer)
+
+
+def get_metadata(doc):
+    return doc.get_metadata()
+
+
+def peak_memory(f):
+    tracemalloc.start()
+    f()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+
+def run(repeat=5):
+    fns = sorted(glob.glob('./tests/input/*/benchmark.json'))
+    print('{:<45} {:<14} {:>10} {:>12}'.format(
+        'file', 'function', 'time (s)', 'peak (KiB)'))
+
+    for fn in fns:
+        with open(fn, encoding='utf-8') as f:
+            doc = pf.load(f)
+
+        for f in (stringify_walk, pf.stringify, get_metadata):
+            func = partial(f, doc)
+            t = min(timeit.repeat(func, number=1, repeat=repeat))
+            print('{:<45} {:<14} {:>10.4f} {:>12.1f}'.format(
+                fn, f.__name__, t, peak_memory(func) / 1024))
+
+
+if __name__ == "__main__":
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    run(repeat)
@@ -0,0 +1,43 @@
+"""
+Time json.load() with and without the panflute decoder (from_json)
+on the documents in tests/input/*/benchmark.json
+
+Usage (from the root folder):
+
+    python tests/benchmarks/bench_load.py [repeat]
+"""
+
+import sys
+import json
+import glob
+import timeit
+import panflute as pf
+
+
+def load_raw(raw):
+    return json.loads(raw)
+
+
+def load_panflute(raw):
+    return json.loads(raw, object_pairs_hook=pf.elements.from_json)
+
+
+def run(repeat=5):
+    fns = sorted(glob.glob('./tests/input/*/benchmark.json'))
+    print('{:<45} {:>10} {:>10} {:>8}'.format('file', 'json', 'panflute', 'ratio'))
+
+    for fn in fns:
+        with open(fn, encoding='utf-8') as f:
+            raw = f.read()
+
+        t_raw = min(timeit.repeat(lambda: load_raw(raw),
+                                  number=1, repeat=repeat))
+        t_pf = min(timeit.repeat(lambda: load_panflute(raw),
+                                 number=1, repeat=repeat))
+        print('{:<45} {:>10.4f} {:>10.4f} {:>8.1f}'.format(
+            fn, t_raw, t_pf, t_pf / t_raw))
+
+
+if __name__ == "__main__":
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    run(repeat)
@@ -0,0 +1,66 @@
+"""
+Time Element.index, .next, .prev and .offset() on every inline of
+paragraphs with many inlines, against a linear scan of the container
+(how ListContainer.index() worked before positions were cached)
+
+Also time iterating over the inlines, against reading each one
+through __getitem__ and attaching it to the parent (how ListContainer
+worked before parents were attached on insertion)
+
+Usage (from the root folder):
+
+    python tests/benchmarks/bench_navigation.py [repeat]
+"""
+
+import sys
+import timeit
+from collections.abc import MutableSequence
+import panflute as pf
+from panflute.containers import attach
+
+
+def long_para(n):
+    items = []
+    for i in range(n // 2):
+        items.extend([pf.Str(str(i)), pf.Space()])
+    return pf.Para(*items)
+
+
+def navigate(para):
+    for item in para.content:
+        item.index, item.next, item.prev, item.offset(1)
+
+
+def linear_scan(para):
+    for item in para.content:
+        MutableSequence.index(para.content, item)
+
+
+def iterate(para):
+    for item in para.content:
+        pass
+
+
+def iterate_attach(para):
+    content = para.content
+    for i in range(len(content)):
+        attach(content.list[i], content.parent, content.location)
+
+
+def run(repeat=5):
+    print('{:<14} {:>8} {:>10} {:>12}'.format(
+        'function', 'inlines', 'time (s)', 'us/inline'))
+
+    for n in (1000, 10000, 50000):
+        para = long_para(n)
+        for f in (navigate, linear_scan, iterate, iterate_attach):
+            if f is linear_scan and n > 10000:
+                continue  # Quadratic
+            t = min(timeit.repeat(lambda: f(para), number=1, repeat=repeat))
+            print('{:<14} {:>8} {:>10.4f} {:>12.2f}'.format(
+                f.__name__, n, t, t / n * 1e6))
+
+
+if __name__ == "__main__":
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    run(repeat)
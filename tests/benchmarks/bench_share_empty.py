@@ -0,0 +1,55 @@
+"""
+Compare the memory used by the documents in tests/input/*/benchmark.json
+when loaded with and without load(..., share_empty=True), as measured by
+tracemalloc, together with the number of shared elements and load times
+
+Usage (from the root folder):
+
+    python tests/benchmarks/bench_share_empty.py [repeat]
+"""
+
+import io
+import sys
+import glob
+import timeit
+import tracemalloc
+import panflute as pf
+
+
+SHARED = (pf.Space, pf.SoftBreak, pf.LineBreak)
+
+
+def measure(raw, **kwargs):
+    tracemalloc.start()
+    doc = pf.load(io.StringIO(raw), **kwargs)
+    size, peak = tracemalloc.get_traced_memory()
+    blocks = sum(stat.count for stat in
+                 tracemalloc.take_snapshot().statistics('filename'))
+    tracemalloc.stop()
+    return doc, size, blocks
+
+
+def run(repeat=5):
+    fns = sorted(glob.glob('./tests/input/*/benchmark.json'))
+    print('{:<40} {:<12} {:>8} {:>11} {:>10} {:>9}'.format(
+        'file', 'share_empty', 'shared', 'size (KiB)', 'blocks', 'load (s)'))
+
+    for fn in fns:
+        with open(fn, encoding='utf-8') as f:
+            raw = f.read()
+        for share_empty in (False, True):
+            doc, size, blocks = measure(raw, validate=False,
+                                        share_empty=share_empty)
+            n = sum(1 for elem in doc.iter(SHARED))
+            del doc
+            t = min(timeit.repeat(
+                lambda: pf.load(io.StringIO(raw), validate=False,
+                                share_empty=share_empty),
+                number=1, repeat=repeat))
+            print('{:<40} {:<12} {:>8} {:>11.1f} {:>10} {:>9.4f}'.format(
+                fn, str(share_empty), n, size / 1024, blocks, t))
+
+
+if __name__ == "__main__":
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    run(repeat)
@@ -0,0 +1,69 @@
+"""
+Time Element.walk() on deeply nested synthetic documents (nested divs,
+emphasis and bullet lists) and on a flat document with the same number
+of elements, using an action that does nothing
+
+Usage (from the root folder):
+
+    python tests/benchmarks/bench_walk.py [repeat]
+"""
+
+import sys
+import timeit
+import panflute as pf
+
+
+def nested_divs(depth):
+    elem = pf.Para(pf.Str('deep'))
+    for i in range(depth):
+        elem = pf.Div(elem, pf.Para(pf.Str(str(i))))
+    return pf.Doc(elem)
+
+
+def nested_emphs(depth):
+    elem = pf.Str('deep')
+    for i in range(depth):
+        elem = pf.Emph(elem, pf.Space(), pf.Str(str(i)))
+    return pf.Doc(pf.Para(elem))
+
+
+def nested_lists(depth):
+    elem = pf.Plain(pf.Str('deep'))
+    for i in range(depth):
+        elem = pf.BulletList(pf.ListItem(elem), pf.ListItem(pf.Plain(pf.Str(str(i)))))
+    return pf.Doc(elem)
+
+
+def flat(depth):
+    return pf.Doc(*(pf.Para(pf.Str(str(i)), pf.Space(), pf.Str('x'))
+                    for i in range(depth)))
+
+
+def count(doc):
+    ans = []
+    doc.walk(lambda elem, doc: ans.append(None))
+    return len(ans)
+
+
+def no_action(elem, doc):
+    pass
+
+
+def run(repeat=5):
+    print('Recursion limit: {}'.format(sys.getrecursionlimit()))
+    print('{:<14} {:>7} {:>9} {:>10} {:>12}'.format(
+        'document', 'depth', 'elements', 'walk (s)', 'us/element'))
+
+    for depth in (100, 1000, 10000, 50000):
+        for builder in (nested_divs, nested_emphs, nested_lists, flat):
+            doc = builder(depth)
+            n = count(doc)
+            t = min(timeit.repeat(lambda: doc.walk(no_action),
+                                  number=1, repeat=repeat))
+            print('{:<14} {:>7} {:>9} {:>10.4f} {:>12.2f}'.format(
+                builder.__name__, depth, n, t, t / n * 1e6))
+
+
+if __name__ == "__main__":
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    run(repeat)
@@ -0,0 +1,100 @@
+import gc
+import sys
+import asyncio
+import warnings
+import pytest
+import panflute as pf
+
+
+def make_doc():
+    return pf.Doc(pf.Para(pf.Str('a'), pf.Space, pf.Emph(pf.Str('b'))),
+                  pf.CodeBlock('c'),
+                  pf.CodeBlock('c'),
+                  metadata={'key': pf.MetaString('d')})
+
+
+def test_shell_async():
+    upper = [sys.executable, '-c',
+             'import sys; sys.stdout.write(sys.stdin.read().upper())']
+    out = asyncio.run(pf.shell_async(upper, b'abc'))
+    assert out == b'ABC'
+
+    with pytest.raises(IOError):
+        asyncio.run(pf.shell_async([sys.executable, '-c', 'exit(1)']))
+
+
+def test_run_filters_async():
+    running = [0, 0]  # Current and maximum number of running actions
+
+    async def slow(value):
+        running[0] += 1
+        running[1] = max(running)
+        await asyncio.sleep(0.01)
+        running[0] -= 1
+        return value
+
+    @pf.element_types(pf.Str, pf.CodeBlock, pf.MetaString)
+    def action(elem, doc, suffix):
+        if isinstance(elem, pf.Str):
+            return slow(pf.Str(elem.text + suffix))
+        elif isinstance(elem, pf.CodeBlock):
+            # Several elements, and none
+            if elem.index == 1:
+                return slow([pf.Para(pf.Str('e')), pf.Para(pf.Str('f'))])
+            return slow([])
+        else:
+            return slow(pf.MetaString(elem.text + suffix))
+
+    def delete_emph(elem, doc, **kwargs):
+        if isinstance(elem, pf.Emph):
+            return []
+
+    doc = asyncio.run(pf.run_filters_async([action, delete_emph],
+                                           doc=make_doc(), limit=2,
+                                           suffix='!'))
+    assert running[1] == 2
+    assert pf.stringify(doc.content[0]).strip() == 'a!'
+    assert [pf.stringify(elem).strip() for elem in doc.content[1:]] == \
+           ['e', 'f']
+    assert doc.get_metadata('key') == 'd!'
+
+    # The results are part of the document
+    for elem in doc.content[1:]:
+        assert elem.parent is doc
+    assert doc.content[0].content[0].parent is doc.content[0]
+
+
+def test_async_actions():
+    # Actions defined with "async def" work too
+    async def action(elem, doc):
+        if isinstance(elem, pf.Str):
+            return pf.Str(elem.text.upper())
+
+    doc = asyncio.run(pf.run_filters_async([action], doc=make_doc()))
+    assert pf.stringify(doc.content[0]).strip() == 'A B'
+
+
+def test_awaitables_for_the_same_element():
+    # Two actions can't both replace an element later, so this is an
+    # error, and the awaitables that won't be awaited are closed
+    created = []
+
+    async def upper(elem):
+        return pf.Str(elem.text.upper())
+
+    def action(elem, doc):
+        if isinstance(elem, pf.Str):
+            created.append(upper(elem))
+            return created[-1]
+
+    for fused in (False, True):
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always')
+            with pytest.raises(ValueError):
+                asyncio.run(pf.run_filters_async([action, action],
+                                                 doc=make_doc(),
+                                                 fused=fused))
+            gc.collect()
+        assert created and all(c.cr_frame is None for c in created)
+        assert not [w for w in caught if 'never awaited' in str(w.message)]
+        del created[:]
@@ -0,0 +1,101 @@
+import io
+import sys
+import glob
+import panflute as pf
+from panflute.backends import JSONBackend, StdlibBackend, build
+from panflute.elements import from_json
+
+
+fns = sorted(glob.glob('./tests/[1-4]/api*/benchmark.json') +
+             glob.glob('./tests/input/*/benchmark.json'))
+
+
+def roundtrip(raw, **kwargs):
+    doc = pf.load(io.StringIO(raw), **kwargs)
+    doc = doc.walk(lambda elem, doc: None)
+    with io.StringIO() as f:
+        pf.dump(doc, f)
+        return f.getvalue()
+
+
+class TwoPhaseStdlibBackend(StdlibBackend):
+    # Standard library parser, but decoding in two phases like other backends
+    name = 'json (two-phase)'
+    decode = JSONBackend.decode
+
+
+def test_parity():
+    backends = [pf.set_json_backend(name)
+                for name in pf.available_json_backends()]
+    backends.append(TwoPhaseStdlibBackend())
+    print('Backends:', backends)
+
+    try:
+        for fn in fns:
+            print('TESTING:', fn)
+            with open(fn, encoding='utf-8') as f:
+                raw = f.read()
+
+            pf.set_json_backend('json')
+            expected = roundtrip(raw)
+            expected_lazy = roundtrip(raw, lazy=True)
+
+            for backend in backends:
+                pf.set_json_backend(backend)
+                assert roundtrip(raw) == expected, backend
+                assert roundtrip(raw, validate=False) == expected, backend
+                assert roundtrip(raw, lazy=True) == expected_lazy, backend
+    finally:
+        pf.set_json_backend()
+
+
+def test_single_pass_decode():
+    # Building the elements dominates decoding, so the built-in backends
+    # all decode in a single pass with the standard library
+    for name in pf.available_json_backends():
+        backend = pf.set_json_backend(name)
+        assert type(backend).decode is StdlibBackend.decode
+        elems = backend.decode('[{"t":"Space"}]', from_json)
+        assert type(elems[0]) == pf.Space
+    pf.set_json_backend()
+
+
+def test_fallback():
+    big = 2 ** 70  # Not supported by orjson or ujson
+    for name in pf.available_json_backends():
+        backend = pf.set_json_backend(name)
+        text = backend.dumps({'a': [big, 'bé', '\x01']})
+        assert text == '{"a":[1180591620717411303424,"bé","\\u0001"]}'
+        assert backend.loads(text) == {'a': [big, 'bé', '\x01']}
+    pf.set_json_backend()
+
+
+def test_unknown_backend():
+    try:
+        pf.set_json_backend('simplejson')
+    except ValueError:
+        pass
+    else:
+        raise AssertionError('expected ValueError')
+    assert pf.get_json_backend().name == pf.available_json_backends()[0]
+
+
+def test_deep_nesting():
+    # Deeper than the recursion limit (orjson and ujson can parse this)
+    depth = sys.getrecursionlimit() * 2
+    data = {'t': 'Str', 'c': 'a'}
+    for _ in range(depth):
+        data = {'t': 'Emph', 'c': [data]}
+    elem = build(data, from_json)
+    for _ in range(depth):
+        assert type(elem) == pf.Emph
+        elem = elem.content[0]
+    assert elem.text == 'a'
+
+
+if __name__ == "__main__":
+    test_parity()
+    test_single_pass_decode()
+    test_fallback()
+    test_unknown_backend()
+    test_deep_nesting()
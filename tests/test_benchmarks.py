@@ -0,0 +1,62 @@
+import io
+import json
+import panflute as pf
+from panflute import benchmarks
+from panflute.benchmarks import memory, throughput
+
+
+def test_documents():
+    raw = benchmarks.synthetic_document(1)
+    doc = pf.load(io.StringIO(raw))
+    assert len(benchmarks.synthetic_document(3)) > 2 * len(raw)
+
+    scaled = pf.load(io.StringIO(benchmarks.scale_document(raw, 10)))
+    assert len(scaled.content) == 10 * len(doc.content)
+    blocks = [block.to_json() for block in doc.content]
+    assert [block.to_json() for block in scaled.content] == blocks * 10
+
+    for fn in benchmarks.corpus_files():
+        assert benchmarks.document_name(fn) in fn
+        with open(fn, encoding='utf-8') as f:
+            data = json.load(f)
+        scaled = json.loads(benchmarks.read_document(fn, 2))
+        blocks = data[1] if isinstance(data, list) else data['blocks']
+        scaled = scaled[1] if isinstance(scaled, list) else scaled['blocks']
+        assert scaled == blocks * 2
+
+
+def test_memory():
+    result = memory.measure(benchmarks.SYNTHETIC, 2)
+    assert result['document'] == 'synthetic'
+    assert result['nodes'] == sum(t['count'] for t in result['types'].values())
+    assert result['traced_bytes'] > 0
+    assert result['bytes_per_node'] > 0
+    json.dumps(result)
+
+    shared = memory.measure(benchmarks.SYNTHETIC, 2, share_empty=True)
+    assert shared['types']['Space']['count'] == 1
+    assert shared['traced_bytes'] < result['traced_bytes']
+
+
+def test_throughput():
+    result = throughput.measure(benchmarks.SYNTHETIC, 1, repeat=1)
+    assert list(result['seconds']) == list(throughput.PHASES)
+    assert all(t >= 0 for t in result['seconds'].values())
+    assert result['overhead'] > 0
+    json.dumps(result)
+
+    obj = json.loads(benchmarks.synthetic_document(1))
+    doc = throughput.construct(obj)
+    assert doc.to_json() == pf.load(io.StringIO(json.dumps(obj))).to_json()
+
+    # Each run of a function that modifies its argument gets a new one
+    docs = []
+    throughput.best_time(docs.append, obj, 3, setup=throughput.construct)
+    assert len(docs) == 3 and len(set(map(id, docs))) == 3
+    assert all(doc.to_json() == docs[0].to_json() for doc in docs)
+
+
+if __name__ == "__main__":
+    test_documents()
+    test_memory()
+    test_throughput()
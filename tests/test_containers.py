@@ -0,0 +1,148 @@
+import glob
+import panflute as pf
+
+
+fns = sorted(glob.glob('./tests/input/*/benchmark.json'))
+
+
+def long_para(n):
+    items = []
+    for i in range(n):
+        items.extend([pf.Str(str(i)), pf.Space()])
+    return pf.Para(*items)
+
+
+def test_navigation():
+    para = long_para(1000)
+    items = list(para.content)
+    for i, item in enumerate(items):
+        assert item.index == i
+        assert item.next is (items[i + 1] if i + 1 < len(items) else None)
+        assert item.prev is (items[i - 1] if i else None)
+        assert item.offset(-i) is items[0]
+
+    # Positions are updated after the list changes
+    first, second = items[:2]
+    del para.content[0]
+    assert second.index == 0
+    assert second.prev is None
+    para.content.insert(0, first)
+    assert first.index == 0 and second.index == 1
+    para.content.extend([pf.Str('a'), pf.Str('b')])
+    assert para.content[-1].prev is para.content[-2]
+    assert para.content[-2].index == len(para.content) - 2
+
+    # Also if .list was modified directly
+    para.content.list.reverse()
+    assert first.index == len(para.content) - 1
+    assert para.content.list.pop() is first
+    try:
+        para.content.index(first)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError('expected ValueError')
+
+    # And after walking
+    def action(elem, doc):
+        if isinstance(elem, pf.Space):
+            return []
+    para = long_para(10)
+    last = para.content[-2]
+    para.walk(action)
+    assert last.index == 9
+    assert last.prev.text == '8'
+
+
+def test_attach():
+    # Parents are set when the items are inserted, not when they are read
+    para = pf.Para(pf.Str('a'))
+    str_b, emph = pf.Str('b'), pf.Emph()
+    para.content.append(str_b)
+    para.content[0] = emph
+    assert str_b.parent is para and emph.parent is para
+    assert all(item.parent is para for item in para.content.list)
+    table = pf.Table(pf.TableRow(pf.TableCell()), caption=[pf.Str('c')])
+    assert table.caption.list[0].parent is table
+    assert table.caption.list[0].location == 'caption'
+
+    # Also for trusted (validate=False) and lazy loads
+    for kwargs in ({}, {'validate': False}, {'lazy': True}):
+        with open(fns[0], encoding='utf-8') as f:
+            doc = pf.load(f, **kwargs)
+        for elem in doc.iter():
+            container = elem.container  # None for e.g. doc.metadata
+            if isinstance(container, pf.ListContainer):
+                assert container.list[elem.index] is elem
+            elif container is not None:
+                assert elem in container.values()
+
+    # Iteration doesn't go through __getitem__, and slices are copies
+    items = list(para.content)
+    assert items == para.content.list
+    assert list(reversed(para.content)) == items[::-1]
+    part = para.content[1:]
+    assert isinstance(part, pf.ListContainer)
+    assert part.list == items[1:] and part.list is not para.content.list
+    assert part.parent is para
+
+
+def test_bulk():
+    para = pf.Para(pf.Str('a'))
+    content = para.content
+    new = [pf.Str('b'), pf.Space, pf.Str('c')]  # Space instead of Space()
+    content.extend(new)
+    assert pf.stringify(para) == 'ab c\n\n'
+    assert isinstance(content[2], pf.Space)
+    assert all(item.parent is para for item in content)
+
+    content.splice(1, 3, [pf.Emph(pf.Str('x'))])
+    assert pf.stringify(para) == 'axc\n\n'
+    assert content[1].parent is para and content[2].index == 2
+    content.splice(3, 3, (pf.Str(str(i)) for i in range(3)))
+    assert pf.stringify(para) == 'axc012\n\n'
+
+    content.replace_all(content[::-1])
+    assert para.content is content
+    assert pf.stringify(para) == '210cxa\n\n'
+    content[:2] = []
+    assert pf.stringify(para) == '0cxa\n\n'
+
+    # The whole batch is rejected if one item has the wrong type
+    for f in (content.extend, content.replace_all,
+              lambda items: content.splice(0, 1, items)):
+        try:
+            f([pf.Str('ok'), pf.Para()])
+        except TypeError:
+            pass
+        else:
+            raise AssertionError('expected TypeError')
+    assert pf.stringify(para) == '0cxa\n\n'
+
+
+def test_check_type():
+    from panflute.utils import check_type, check_types
+
+    space = pf.Space()
+    assert check_type(space, pf.Inline) is space
+    assert isinstance(check_type(pf.Space, pf.Inline), pf.Space)
+    assert check_type(pf.Space, pf.Inline) is not check_type(pf.Space, pf.Inline)
+    assert check_type('a', str) == 'a'
+    assert check_type(1.5, (float, int)) == 1.5
+    assert check_types([space, pf.Space], pf.Inline)[0] is space
+
+    for value, oktypes in ((space, pf.Block), (pf.Space, pf.Block),
+                           (1, str), ('a', pf.Inline)):
+        try:
+            check_type(value, oktypes)
+        except TypeError:
+            pass
+        else:
+            raise AssertionError('expected TypeError')
+
+
+if __name__ == "__main__":
+    test_navigation()
+    test_attach()
+    test_bulk()
+    test_check_type()
@@ -0,0 +1,95 @@
+import os
+import json
+import time
+import panflute as pf
+from panflute import tools
+
+
+class FakeInfo(object):
+    version = (2, 9)
+
+
+def fake_pandoc(monkeypatch):
+    # Stand in for pandoc: markdown -> a paragraph with a single Str
+    calls = []
+
+    def inner_convert_text(text, input_format, output_format, extra_args):
+        calls.append(text)
+        para = {'t': 'Para', 'c': [{'t': 'Str', 'c': text}]}
+        return json.dumps({'pandoc-api-version': [1, 20], 'meta': {},
+                           'blocks': [para] * len(extra_args or [1])})
+
+    monkeypatch.setattr(tools, 'get_pandoc_info', lambda: FakeInfo)
+    monkeypatch.setattr(tools, 'inner_convert_text', inner_convert_text)
+    return calls
+
+
+def test_memory(monkeypatch):
+    calls = fake_pandoc(monkeypatch)
+    monkeypatch.delenv(tools.CACHE_ENVIRON, raising=False)
+    cache = pf.set_convert_cache(tools.ConvertCache(size=2))
+    try:
+        a = pf.convert_text('a')
+        assert calls == ['a']
+
+        # Cached results are new elements every time
+        b = pf.convert_text('a')
+        assert calls == ['a']
+        assert repr(a) == repr(b) and a[0] is not b[0]
+        b[0].content[0].text = 'changed'
+        assert pf.convert_text('a')[0].content[0].text == 'a'
+
+        # The arguments are part of the key
+        pf.convert_text('a', extra_args=['--x', '--y'])
+        assert calls == ['a', 'a']
+
+        # Least recently used results are discarded
+        pf.convert_text('b')
+        pf.convert_text('a')
+        assert calls == ['a', 'a', 'b', 'a']
+        assert cache.hits == 2 and cache.misses == 4
+    finally:
+        pf.set_convert_cache(None)
+    pf.convert_text('a')
+    assert calls == ['a', 'a', 'b', 'a', 'a']
+
+
+def test_disk(tmp_path, monkeypatch):
+    calls = fake_pandoc(monkeypatch)
+    folder = str(tmp_path / 'convert')
+
+    # Results are shared by caches (e.g. by other processes)
+    try:
+        pf.set_convert_cache(tools.ConvertCache(folder=folder))
+        pf.convert_text('a')
+        pf.set_convert_cache(tools.ConvertCache(folder=folder))
+        pf.convert_text('a')
+        assert calls == ['a']
+
+        # The least recently used files are deleted
+        size = os.path.getsize(os.path.join(folder, os.listdir(folder)[0]))
+        cache = pf.set_convert_cache(
+            tools.ConvertCache(size=0, folder=folder, max_bytes=size * 4))
+        for text in 'bcdae':
+            time.sleep(0.01)  # So the files have different times
+            pf.convert_text(text)
+        assert len(os.listdir(folder)) == 3
+        pf.convert_text('a')
+        assert calls == ['a', 'b', 'c', 'd', 'e']
+
+        cache.clear()
+        assert os.listdir(folder) == []
+    finally:
+        pf.set_convert_cache(None)
+
+
+def test_disk_overwrite(tmp_path):
+    folder = str(tmp_path / 'convert')
+    cache = tools.ConvertCache(folder=folder)
+    cache.put('other', 'x')
+    cache.put('key', 'a' * 100)
+    # Writing a key again replaces its file, so only its new size counts
+    for out in ('b' * 100, 'c' * 50, 'd' * 200):
+        cache.put('key', out)
+    assert cache._disk_bytes == sum(
+        os.path.getsize(os.path.join(folder, fn)) for fn in os.listdir(folder))
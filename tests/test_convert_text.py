@@ -108,5 +108,42 @@ def test_all():
     assert md == md2panflute2md
 
 
+def test_convert_text_many():
+    texts = ['Some *markdown*', '', '# A header\n\nAnd a paragraph',
+             '- a list\n- of items']
+
+    # Same results as converting the texts one by one
+    for output_format in ('panflute', 'markdown', 'html', 'latex'):
+        print("\nBatch conversion: md ->", output_format)
+        many = pf.convert_text_many(texts, output_format=output_format)
+        single = [pf.convert_text(text, output_format=output_format)
+                  for text in texts]
+        print(many)
+        assert repr(many) == repr(single)
+
+    print("\nBatch conversion: panflute -> md")
+    elems = [pf.convert_text(text) for text in texts]
+    many = pf.convert_text_many(elems, input_format='panflute',
+                                output_format='markdown')
+    assert many == [pf.convert_text(elem, input_format='panflute',
+                                    output_format='markdown')
+                    for elem in elems]
+
+    print("\nBatch conversion: footnotes and references are not shared")
+    texts = ['a[^1]\n\n[^1]: one', 'b[^1]\n\n[^1]: two',
+             'c [x]\n\n[x]: http://x', 'd [x]', 'e^[inline note]', 'f']
+    for output_format in ('panflute', 'html'):
+        many = pf.convert_text_many(texts, output_format=output_format)
+        single = [pf.convert_text(text, output_format=output_format)
+                  for text in texts]
+        assert repr(many) == repr(single)
+
+    print("\nBatch conversion: unclosed code block (falls back)")
+    texts = ['```\ncode', 'text']
+    many = pf.convert_text_many(texts)
+    assert repr(many) == repr([pf.convert_text(text) for text in texts])
+
+
 if __name__ == "__main__":
     test_all()
+    test_convert_text_many()
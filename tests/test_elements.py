@@ -0,0 +1,118 @@
+import json
+import panflute as pf
+
+
+def plain(obj):
+    # Compare the JSON, regardless of tuples or OrderedDicts
+    return json.loads(json.dumps(obj))
+
+
+def para_json(text):
+    return {'t': 'Para', 'c': [{'t': 'Str', 'c': text}]}
+
+
+def test_inline_and_block_bases():
+    # InlineBlock elements are both inlines and blocks
+    span = pf.Span(pf.Str('a'), identifier='x', classes=['c'],
+                   attributes={'k': 'v'})
+    assert isinstance(span, pf.Inline) and isinstance(span, pf.Block)
+    assert span.identifier == 'x' and span.classes == ['c']
+    assert plain(span.to_json()) == {
+        't': 'Span',
+        'c': [['x', ['c'], [['k', 'v']]], [{'t': 'Str', 'c': 'a'}]]}
+
+    # OrderedList doesn't add its attributes to every block
+    assert 'start' not in pf.Block.__slots__
+    assert repr(pf.Para(pf.Str('a'))) == 'Para(Str(a))'
+    assert repr(pf.Doc(pf.Para(pf.Str('a'))))
+
+
+def test_child_types():
+    note = pf.Note(pf.Para(pf.Str('a')))
+    assert plain(note.to_json()) == {'t': 'Note', 'c': [para_json('a')]}
+    quote = pf.BlockQuote(pf.Para(pf.Str('a')))
+    assert plain(quote.to_json()) == {'t': 'BlockQuote',
+                                      'c': [para_json('a')]}
+    for cls in (pf.Note, pf.BlockQuote):
+        try:
+            cls(pf.Str('a'))
+        except TypeError:
+            pass
+        else:
+            raise AssertionError('expected TypeError')
+
+
+def test_code():
+    code = pf.Code('x = 1', identifier='a', classes=['python'])
+    para = pf.Para(pf.Str('b'), code)
+    assert para.content[1] is code and code.parent is para
+    assert plain(code.to_json()) == {
+        't': 'Code', 'c': [['a', ['python'], []], 'x = 1']}
+
+
+def test_math():
+    math = pf.Math('x^2', format='InlineMath')
+    assert plain(math.to_json()) == {'t': 'Math',
+                                     'c': [{'t': 'InlineMath'}, 'x^2']}
+    assert pf.Math('x').format == 'DisplayMath'
+    assert pf.RawInline('<b>', format='html').format == 'html'
+    for cls, format in ((pf.Math, 'html'), (pf.RawInline, 'InlineMath')):
+        try:
+            cls('x', format=format)
+        except TypeError:
+            pass
+        else:
+            raise AssertionError('expected TypeError')
+
+
+def test_meta_values():
+    meta = pf.MetaList(pf.MetaString('a'), pf.MetaString('b'))
+    assert [item.text for item in meta.content] == ['a', 'b']
+    meta = pf.MetaMap(key=pf.MetaBool(True))
+    assert meta['key'].boolean is True
+    meta = pf.MetaInlines(pf.Str('a'))
+    assert plain(meta.to_json()) == {'t': 'MetaInlines',
+                                     'c': [{'t': 'Str', 'c': 'a'}]}
+    meta = pf.MetaBlocks(pf.Para(pf.Str('a')))
+    assert plain(meta.to_json()) == {'t': 'MetaBlocks', 'c': [para_json('a')]}
+
+
+def test_untagged_items():
+    # Pandoc encodes these as plain lists of their items
+    para = pf.Para(pf.Str('a'))
+    bullets = pf.BulletList(pf.ListItem(para))
+    assert plain(bullets.to_json()) == {'t': 'BulletList',
+                                        'c': [[para_json('a')]]}
+
+    lines = pf.LineBlock(pf.LineItem(pf.Str('a')))
+    assert plain(lines.to_json()) == {'t': 'LineBlock',
+                                      'c': [[{'t': 'Str', 'c': 'a'}]]}
+
+    item = pf.DefinitionItem([pf.Str('term')],
+                             [pf.Definition(pf.Para(pf.Str('a')))])
+    assert plain(pf.DefinitionList(item).to_json()) == {
+        't': 'DefinitionList',
+        'c': [[[{'t': 'Str', 'c': 'term'}], [[para_json('a')]]]]}
+
+    row = pf.TableRow(pf.TableCell(pf.Para(pf.Str('a'))))
+    assert plain(row.to_json()) == [[para_json('a')]]
+
+
+def test_walk_children():
+    def upper(elem, doc):
+        if isinstance(elem, pf.Str):
+            return pf.Str(elem.text.upper())
+
+    doc = pf.Doc(pf.Para(pf.Str('a'), pf.Emph(pf.Str('b'))))
+    doc = doc.walk(upper)
+    assert pf.stringify(doc) == 'AB\n\n'
+
+
+if __name__ == "__main__":
+    test_inline_and_block_bases()
+    test_child_types()
+    test_code()
+    test_math()
+    test_meta_values()
+    test_untagged_items()
+    test_walk_children()
@@ -0,0 +1,454 @@
+import io
+import json
+import glob
+from collections import OrderedDict
+import panflute as pf
+
+
+fns = sorted(glob.glob('./tests/[1-4]/api*/benchmark.json') +
+             glob.glob('./tests/input/*/benchmark.json'))
+
+
+def empty_action(elem, doc):
+    pass
+
+
+def dump_to_string(doc):
+    with io.StringIO() as f:
+        pf.dump(doc, f)
+        return f.getvalue()
+
+
+def test_load_trusted():
+    for fn in fns:
+        print('TESTING:', fn)
+        with open(fn, encoding='utf-8') as f:
+            doc = pf.load(f)
+        with open(fn, encoding='utf-8') as f:
+            trusted = pf.load(f, validate=False)
+
+        assert repr(doc.content) == repr(trusted.content)
+        assert doc.get_metadata() == trusted.get_metadata()
+        assert dump_to_string(doc) == dump_to_string(trusted)
+
+
+def test_trusted_edits_are_validated():
+    raw = ('{"pandoc-api-version":[1,17,0,4],"meta":{},'
+           '"blocks":[{"t":"Para","c":[{"t":"Str","c":"a"}]}]}')
+    doc = pf.load(io.StringIO(raw), validate=False)
+    para = doc.content[0]
+    para.content.append(pf.Space)
+    assert repr(para) == 'Para(Str(a) Space)'
+
+    try:
+        para.content.append(pf.Para())
+    except TypeError:
+        pass
+    else:
+        raise AssertionError('Para accepted a block element')
+
+
+def test_load_lazy():
+    for fn in fns:
+        print('TESTING:', fn)
+        with open(fn, encoding='utf-8') as f:
+            raw = f.read().rstrip('\n')
+        doc = pf.load(io.StringIO(raw))
+        lazy = pf.load(io.StringIO(raw), lazy=True)
+        assert doc.get_metadata() == lazy.get_metadata()
+
+        # Untouched blocks are written back verbatim
+        n = len(lazy.content)
+        assert lazy.content.pending == n
+        assert dump_to_string(lazy) == raw
+
+        # Blocks are decoded on first access
+        if n:
+            assert repr(lazy.content[-1]) == repr(doc.content[-1])
+            assert lazy.content.pending == n - 1
+
+        lazy = lazy.walk(empty_action)
+        assert repr(doc.content) == repr(lazy.content)
+
+    # Changes are tracked per document, without patching the elements
+    assert '__setattr__' not in vars(pf.Element)
+
+
+def upper_action(elem, doc):
+    if isinstance(elem, pf.Str):
+        elem.text = elem.text.upper()
+
+
+def add_class(elem, doc):
+    if isinstance(elem, pf.CodeBlock):
+        elem.classes.append('extra')
+
+
+def test_dump_unmodified():
+    for fn in fns:
+        print('TESTING:', fn)
+        with open(fn, encoding='utf-8') as f:
+            raw = f.read().rstrip('\n')
+
+        # Decoded but unmodified blocks are also written back verbatim
+        lazy = pf.load(io.StringIO(raw), lazy=True).walk(empty_action)
+        assert lazy.content.pending == 0
+        assert dump_to_string(lazy) == raw
+
+        # Modified blocks (including in-place changes) are encoded again
+        for action in (upper_action, add_class):
+            doc = pf.load(io.StringIO(raw)).walk(action)
+            lazy = pf.load(io.StringIO(raw), lazy=True).walk(action)
+            # (compare the decoded JSON, as Pandoc and Python format
+            # some floats differently)
+            assert json.loads(dump_to_string(doc)) == \
+                json.loads(dump_to_string(lazy))
+
+        # Replacing a nested element
+        lazy = pf.load(io.StringIO(raw), lazy=True)
+        paras = [e for e in lazy.content if isinstance(e, pf.Para) and e.content]
+        if paras:
+            paras[0].content[0] = pf.Str('REPLACED')
+            assert 'REPLACED' in dump_to_string(lazy)
+
+
+def test_lazy_changes():
+    raw = ('{"pandoc-api-version":[1,17,0,4],"meta":{},"blocks":['
+           '{"t":"Div","c":[["",["a"],[]],[{"t":"Para","c":'
+           '[{"t":"Str","c":"b"}]}]]},'
+           '{"t":"CodeBlock","c":[["",[],[]],"c"]},'
+           '{"t":"Para","c":[{"t":"Emph","c":[{"t":"Str","c":"1e-05"}]}]},'
+           '{"t":"Table","c":[[],[{"t":"AlignDefault"}],[1e-05],[],[]]}]}')
+    doc = pf.load(io.StringIO(raw), validate=False, lazy=True)
+    div, code, para, table = doc.content
+    dumps = pf.get_json_backend().dumps
+
+    # Only the original JSON of the decoded blocks is kept
+    assert doc.content.raw == dict(zip(doc.content, json_blocks(raw)))
+
+    # Reading classes and attributes is not a change, but modifying
+    # them in place is, as is setting attributes of nested elements
+    assert code.classes == [] and not div.attributes
+    assert dump_to_string(doc) == raw
+    code.classes.append('x')
+    para.content[0].content[0].text = 'e'
+    table.width[0] = 0.5
+    blocks = json.loads(dump_to_string(doc))['blocks']
+    assert blocks[1]['c'][0] == ['', ['x'], []]
+    assert blocks[2]['c'][0]['c'][0]['c'] == 'e'
+    assert blocks[3]['c'][2] == [0.5]
+    assert doc.content.get_raw(div, dumps) == json_blocks(raw)[0]
+
+
+def json_blocks(raw):
+    # Original JSON of each top-level block of a document
+    blocks = json.loads(raw)['blocks']
+    return [json.dumps(block, separators=(',', ':')) for block in blocks]
+
+
+def make_actions():
+    def emph_to_strong(elem, doc):
+        if isinstance(elem, pf.Emph):
+            return pf.Strong(*elem.content)
+
+    def mark_strs(elem, doc):
+        if isinstance(elem, pf.Str):
+            elem.text = elem.text + '!'
+
+    def wrap_paras(elem, doc):
+        if isinstance(elem, pf.Para):
+            return pf.Div(elem, classes=['wrapped'])
+
+    def delete_strong(elem, doc):
+        if isinstance(elem, pf.Strong) and len(elem.content) == 1:
+            return []
+
+    def split_headers(elem, doc):
+        if isinstance(elem, pf.Header):
+            return [elem, pf.Para(pf.Str('after'))]
+
+    return [emph_to_strong, mark_strs, wrap_paras, delete_strong,
+            split_headers, mark_strs]
+
+
+def test_run_filters_fused():
+    for fn in fns:
+        print('TESTING:', fn)
+        with open(fn, encoding='utf-8') as f:
+            raw = f.read()
+
+        # Each action must be applied once to every element (including
+        # the new ones), even if there is a single walk
+        ans = []
+        for fused in (False, True):
+            doc = pf.load(io.StringIO(raw))
+            doc = pf.run_filters(make_actions(), doc=doc, fused=fused)
+            ans.append(dump_to_string(doc))
+        assert ans[0] == ans[1]
+
+
+def test_run_filters_order():
+    # With fused=True, an action sees the children of an element after
+    # the following actions have changed them
+    def make_doc():
+        return pf.Doc(pf.Para(pf.Str('Cuenta'), pf.Space, pf.Str('las')))
+
+    def record_text(elem, doc):
+        if isinstance(elem, pf.Para):
+            texts.append(pf.stringify(elem).strip())
+
+    texts = []
+    doc = pf.run_filters([record_text, upper_action], doc=make_doc())
+    assert texts == ['Cuenta las']
+    assert pf.stringify(doc).strip() == 'CUENTA LAS'
+
+    texts = []
+    doc = pf.run_filters([record_text, upper_action], doc=make_doc(),
+                         fused=True)
+    assert texts == ['CUENTA LAS']
+    assert pf.stringify(doc).strip() == 'CUENTA LAS'
+
+
+def test_walk_types():
+    for fn in fns:
+        print('TESTING:', fn)
+        with open(fn, encoding='utf-8') as f:
+            raw = f.read()
+
+        for types in (pf.CodeBlock, (pf.Str, pf.Header), pf.Note, pf.Block,
+                      pf.MetaString, pf.Citation):
+            seen = {}
+            for restricted in (False, True):
+                calls = seen[restricted] = []
+
+                def action(elem, doc):
+                    if restricted or isinstance(elem, types):
+                        calls.append(elem.tag)
+                        if isinstance(elem, pf.Str):
+                            return pf.Str(elem.text.upper())
+
+                doc = pf.load(io.StringIO(raw))
+                doc = doc.walk(action, types=types if restricted else None)
+                seen[restricted] = calls, dump_to_string(doc)
+            assert seen[False] == seen[True]
+
+        # Same with run_filter and the decorator
+        @pf.element_types(pf.Emph, pf.Strong)
+        def delete(elem, doc):
+            return []
+
+        expected = pf.run_filter(lambda e, doc: [] if isinstance(
+            e, (pf.Emph, pf.Strong)) else None, doc=pf.load(io.StringIO(raw)))
+        ans = pf.run_filter(delete, doc=pf.load(io.StringIO(raw)))
+        assert dump_to_string(ans) == dump_to_string(expected)
+        upper = pf.element_types(pf.Str)(
+            lambda elem, doc: upper_action(elem, doc))
+        ans = pf.run_filters([delete, upper], doc=pf.load(io.StringIO(raw)),
+                             fused=True)
+        expected = pf.run_filters([delete, upper_action],
+                                  doc=pf.load(io.StringIO(raw)))
+        assert dump_to_string(ans) == dump_to_string(expected)
+        pf.run_filter(add_class, types=pf.CodeBlock,
+                            doc=pf.load(io.StringIO(raw)))
+        assert not hasattr(add_class, 'types')
+
+
+def test_single_type():
+    def make_doc():
+        return pf.Doc(pf.Para(pf.Str('a'), pf.Emph(pf.Str('b'))))
+
+    expected = dump_to_string(pf.run_filter(upper_action, doc=make_doc()))
+
+    # A single class (set by hand) instead of a tuple
+    def action(elem, doc):
+        return upper_action(elem, doc)
+    action.types = pf.Str
+
+    # Nested tuples are flattened
+    nested = pf.element_types((pf.Str, pf.Emph), pf.Strong)(
+        lambda elem, doc: upper_action(elem, doc))
+    assert nested.types == (pf.Str, pf.Emph, pf.Strong)
+
+    single = pf.element_types(pf.Str)(
+        lambda elem, doc: upper_action(elem, doc))
+    assert single.types == (pf.Str,)
+
+    for act in (action, nested, single):
+        for fused in (False, True):
+            doc = pf.run_filters([act], doc=make_doc(), fused=fused)
+            assert dump_to_string(doc) == expected
+        doc = pf.run_filters([act, action], doc=make_doc(), fused=True)
+        assert dump_to_string(doc) == expected
+
+
+def check_location(elem):
+    container = elem.container
+    i = elem.index
+    assert container.list[i] is elem
+    assert elem.next is (container.list[i + 1]
+                         if i + 1 < len(container) else None)
+    assert elem.prev is (container.list[i - 1] if i else None)
+
+
+def test_share_empty():
+    for fn in sorted(glob.glob('./tests/[1-4]/api*/benchmark.json')):
+        print('TESTING:', fn)
+        with open(fn, encoding='utf-8') as f:
+            raw = f.read()
+        for kwargs in ({}, {'validate': False}, {'lazy': True}):
+            doc = pf.load(io.StringIO(raw))
+            shared = pf.load(io.StringIO(raw), share_empty=True, **kwargs)
+            spaces = list(shared.iter(pf.Space))
+            assert all(space is spaces[0] for space in spaces)
+            assert len(spaces) == len(list(doc.iter(pf.Space)))
+            assert dump_to_string(shared) == dump_to_string(doc)
+
+            # Each document has its own instances
+            other = pf.load(io.StringIO(raw), share_empty=True, **kwargs)
+            if spaces:
+                assert next(other.iter(pf.Space)) is not spaces[0]
+
+            # Shared elements get located as they are read
+            empty = (pf.Space, pf.SoftBreak, pf.LineBreak)
+            for elem in shared.iter(empty):
+                check_location(elem)
+
+            def action(elem, doc):
+                if isinstance(elem, empty):
+                    check_location(elem)
+                    assert elem.doc is doc
+
+            shared.walk(action)
+            for para in shared.find_all(pf.Para):
+                for elem in para.content:
+                    if isinstance(elem, empty):
+                        check_location(elem)
+                for i in reversed(range(len(para.content))):
+                    elem = para.content[i]
+                    if isinstance(elem, empty):
+                        check_location(elem)
+                for elem in reversed(para.content):
+                    if isinstance(elem, empty):
+                        check_location(elem)
+
+            # Replacing them
+            def replace(elem, doc):
+                if type(elem) == pf.Space:
+                    return pf.Str('_')
+
+            shared.walk(replace)
+            assert not list(shared.iter(pf.Space))
+            assert pf.stringify(shared) == pf.stringify(doc.walk(replace))
+
+    # Elements with attributes are not shared, so editing one of them
+    # doesn't change the others
+    raw = json.dumps({'pandoc-api-version': [1, 20], 'meta': {},
+                      'blocks': [{'t': 'HorizontalRule'}] * 2})
+    shared = pf.load(io.StringIO(raw), share_empty=True)
+    first, second = shared.content
+    assert first is not second
+    first.identifier = 'first'
+    assert not second.identifier
+
+    # The regular containers are left as they were
+    assert pf.ListContainer.__iter__.__qualname__ == 'ListContainer.__iter__'
+    assert all(type(para.content) is pf.ListContainer
+               for para in doc.find_all(pf.Para))
+
+
+def test_share_empty_nested():
+    # Line items, definition items and citations are built by the decoder
+    # of their parent, so their inlines don't go through the JSON hook
+    def words(*args):
+        ans = [pf.Str(args[0])]
+        for arg in args[1:]:
+            ans.extend([pf.Space(), pf.Str(arg)])
+        return ans
+
+    citation = pf.Citation('id', prefix=words('see', 'also'),
+                           suffix=words('p.', '1'))
+    doc = pf.Doc(
+        pf.LineBlock(pf.LineItem(*words('a', 'b', 'c'))),
+        pf.DefinitionList(pf.DefinitionItem(
+            words('term', 'x'), [pf.Definition(pf.Para(*words('d', 'e')))])),
+        pf.Para(pf.Cite(*words('[see', 'also'), citations=[citation])))
+    raw = dump_to_string(doc)
+
+    for kwargs in ({}, {'validate': False}, {'lazy': True}):
+        shared = pf.load(io.StringIO(raw), share_empty=True, **kwargs)
+        spaces = list(shared.iter(pf.Space))
+        assert len(spaces) == 7
+        assert all(space is spaces[0] for space in spaces)
+        assert dump_to_string(shared) == raw
+
+        line = shared.content[0].content[0]
+        item = shared.content[1].content[0]
+        citation = shared.content[2].content[0].citations[0]
+        for elem, child in ((line, 'content'), (item, 'term'),
+                            (citation, 'prefix'), (citation, 'suffix')):
+            container = getattr(elem, child)
+            assert type(container) is pf.containers.SharedListContainer
+            space = container[1]
+            assert space.parent is elem
+            assert space.location == container.location
+            check_location(space)
+
+        def action(elem, doc):
+            if type(elem) == pf.Space:
+                check_location(elem)
+
+        shared.walk(action)
+
+
+def test_compact_attributes():
+    types = (pf.Header, pf.Div, pf.CodeBlock, pf.Span, pf.Link, pf.Image)
+    for fn in fns:
+        print('TESTING:', fn)
+        with open(fn, encoding='utf-8') as f:
+            raw = f.read().rstrip('\n')
+        for kwargs in ({}, {'validate': False}, {'lazy': True}):
+            doc = pf.load(io.StringIO(raw), **kwargs)
+            dumped = dump_to_string(doc)
+            for elem in doc.iter(types):
+                # Empty classes and attributes are not stored
+                assert elem._classes is None or elem._classes
+                assert elem._attributes is None or elem._attributes
+                assert isinstance(elem.classes, list)
+                assert isinstance(elem.attributes, OrderedDict)
+            # Reading them is not a change
+            assert dump_to_string(doc) == dumped
+            if kwargs.get('lazy'):
+                assert dumped == raw
+
+    div = pf.Div(pf.Para(pf.Str('a')))
+    assert div._classes is None and div._attributes is None
+    div.classes.append('x')
+    div.attributes['k'] = 'v'
+    assert div._ica_to_json() == ['', ['x'], [('k', 'v')]]
+
+    # Nor by printing the elements
+    span = pf.Span(pf.Str('a'), attributes={'k': 'v'})
+    assert 'attributes=' in repr(span) and 'classes=' not in repr(span)
+    assert span._classes is None and type(span._attributes) is list
+
+    span = pf.Span(classes=['x'], attributes={'k': 'v'})
+    assert span._attributes == [['k', 'v']]
+    assert span.attributes == OrderedDict([('k', 'v')])
+    assert span._attributes is span.attributes
+    span.attributes = {}
+    assert span._attributes is None
+    assert span._ica_to_json() == ['', ['x'], []]
+
+
+if __name__ == "__main__":
+    test_load_trusted()
+    test_trusted_edits_are_validated()
+    test_load_lazy()
+    test_dump_unmodified()
+    test_lazy_changes()
+    test_run_filters_fused()
+    test_run_filters_order()
+    test_walk_types()
+    test_share_empty()
+    test_share_empty_nested()
+    test_compact_attributes()
@@ -0,0 +1,47 @@
+import os
+import sys
+from panflute import tools
+from panflute.tools import PandocInfo
+
+
+version = """pandoc 2.9.2.1
+Compiled with pandoc-types 1.20, texmath 0.12.0.2, skylighting 0.8.5
+Default user data directory: /home/user/.local/share/pandoc or /home/user/.pandoc
+Copyright (C) 2006-2020 John MacFarlane
+"""
+
+
+def test_parse_version():
+    facts = tools._parse_pandoc_version(version)
+    assert facts['version'] == [2, 9, 2, 1]
+    assert facts['data_dir'].startswith('/home/user/.local/share/pandoc')
+
+    facts = tools._parse_pandoc_version(
+        'pandoc 3.1.11\nUser data directory: /data\n')
+    assert facts == {'version': [3, 1, 11], 'data_dir': '/data'}
+
+
+def test_cache(tmp_path, monkeypatch):
+    # Any executable works, as long as the facts are already known
+    path = sys.executable
+    monkeypatch.setenv(tools.CACHE_ENVIRON, str(tmp_path / 'cache'))
+
+    info = PandocInfo(path)
+    assert info._facts == {}
+    info._facts = {'version': [2, 9], 'data_dir': '/data',
+                   'api_version': [1, 20]}
+    info._write_cache()
+
+    info = PandocInfo(path)
+    assert info.version == (2, 9)
+    assert info.api_version == (1, 20)
+    assert info.data_dir == '/data'
+
+    # Reused only while the executable is not modified
+    info.mtime += 1
+    info._write_cache()
+    assert PandocInfo(path)._facts == {}
+
+    # No caching on disk without the environment variable
+    monkeypatch.delenv(tools.CACHE_ENVIRON)
+    assert PandocInfo(path)._facts == {}
@@ -0,0 +1,143 @@
+import os
+import sys
+import pytest
+import panflute as pf
+from panflute import tools
+from panflute.tools import PandocPool, PandocInfo
+
+
+# Stands in for pandoc: reads all of stdin, then converts it
+upper = [sys.executable, '-c',
+         'import sys; sys.stdout.write(sys.stdin.read().upper())']
+fail = [sys.executable, '-c', 'import sys; sys.stdin.read(); sys.exit(1)']
+
+
+def alive(procs):
+    return [proc for proc in procs if proc.poll() is None]
+
+
+def test_pool():
+    pool = PandocPool(size=2)
+    try:
+        # Arguments used once don't get idle processes
+        assert pool.run(upper, 'a') == 'A'
+        assert not pool._idle
+
+        # ... but repeated ones do, and later calls use them,
+        # starting new ones until there are `size` again
+        assert pool.run(upper, 'b') == 'B'
+        idle = list(pool._idle.values())[0]
+        assert len(alive(idle)) == 2
+        first = idle[0]
+        assert pool.run(upper, 'c') == 'C'
+        idle = list(pool._idle.values())[0]
+        assert len(alive(idle)) == 2 and first not in idle
+        first = idle[0]
+
+        for _ in range(3):
+            with pytest.raises(IOError):
+                pool.run(fail)
+        assert len(pool._idle) == 2
+    finally:
+        pool.close()
+    assert not pool._idle
+    assert first.poll() is not None
+
+
+def test_pool_size():
+    for size in (1, 3):
+        pool = PandocPool(size=size, max_commands=1)
+        try:
+            for text in 'abcd':
+                assert pool.run(upper, text) == text.upper()
+                procs = [p for idle in pool._idle.values() for p in idle]
+                assert len(alive(procs)) == (size if text != 'a' else 0)
+
+            # Only the processes of the most recent arguments are kept
+            other = upper + ['other']
+            for text in 'ab':
+                assert pool.run(other, text) == text.upper()
+            assert alive(procs) == []
+            assert list(pool._idle) == [(os.getcwd(), tuple(other))]
+            procs = pool._idle[os.getcwd(), tuple(other)]
+            assert len(alive(procs)) == size
+        finally:
+            pool.close()
+        for proc in procs:
+            proc.wait()
+        assert alive(procs) == []
+
+
+def test_set_pandoc_pool():
+    # Disabled by default
+    default = pf.get_pandoc_pool()
+    assert default.size == 0
+    try:
+        pool = pf.set_pandoc_pool(0)
+        assert pf.get_pandoc_pool() is pool
+        assert pool.run(upper, 'a') == pool.run(upper, 'a') == 'A'
+        assert not pool._idle
+    finally:
+        pf.set_pandoc_pool(default)
+
+
+# Stands in for pandoc: echoes its input, appending a line to a log
+# file each time it runs a conversion (like -o or filters would)
+fake_pandoc = """#!{}
+import os, sys
+files = [arg for arg in sys.argv[1:] if os.path.isfile(arg)]
+text = ''.join(open(fn).read() for fn in files) if files else sys.stdin.read()
+with open({!r}, 'a') as f:
+    f.write(' '.join(sys.argv[1:]) + '\\n')
+sys.stdout.write(text)
+"""
+
+
+def test_side_effects(tmp_path, monkeypatch):
+    log = str(tmp_path / 'log.txt')
+    path = str(tmp_path / 'pandoc')
+    with open(path, 'w') as f:
+        f.write(fake_pandoc.format(sys.executable, log))
+    os.chmod(path, 0o755)
+    infile = str(tmp_path / 'in.md')
+    with open(infile, 'w') as f:
+        f.write('from file')
+    outfile = str(tmp_path / 'out.html')
+
+    info = PandocInfo(path)
+    monkeypatch.setattr(tools, 'get_pandoc_info', lambda: info)
+    monkeypatch.setattr(tools, '_pandoc_pool', PandocPool(size=2))
+
+    def runs():
+        with open(log) as f:
+            return len(f.read().splitlines())
+
+    try:
+        # Arbitrary arguments never start processes ahead of time
+        for _ in range(3):
+            assert pf.run_pandoc(args=['--to=html', infile]) == 'from file'
+        assert runs() == 3
+        assert not tools._pandoc_pool._idle
+
+        # Neither do conversions with files in their arguments
+        for _ in range(3):
+            assert tools.inner_convert_text(
+                'x', 'markdown', 'html', ['--out=' + outfile]) == 'x'
+        assert runs() == 6
+        assert not tools._pandoc_pool._idle
+
+        # Conversions from stdin to stdout do, but only run when called
+        for text in 'abc':
+            assert tools.inner_convert_text(
+                text, 'markdown', 'html', ['--wrap=none']) == text
+        assert runs() == 9
+        assert tools._pandoc_pool._idle
+    finally:
+        tools._pandoc_pool.close()
+    assert runs() == 9
+
+
+if __name__ == "__main__":
+    test_pool()
+    test_pool_size()
+    test_set_pandoc_pool()
@@ -0,0 +1,74 @@
+import io
+import os
+import json
+import panflute as pf
+from panflute import profiler
+
+
+def make_doc():
+    return pf.Doc(pf.Para(pf.Str('a'), pf.Space, pf.Emph(pf.Str('b'))),
+                  pf.Para(pf.Str('c')),
+                  metadata={'panflute-profile': True})
+
+
+def emph_to_strong(elem, doc):
+    if isinstance(elem, pf.Emph):
+        return pf.Strong(*elem.content)
+
+
+def delete_spaces(elem, doc):
+    if isinstance(elem, pf.Space):
+        return []
+
+
+def test_run_filters_counters():
+    doc = make_doc()
+    prof = profiler.FilterProfiler()
+    stats = prof.start_filter('test')
+    profiler.set_active_profiler(prof)
+    try:
+        doc = pf.run_filters([emph_to_strong, delete_spaces], doc=doc)
+        doc = pf.run_filter(delete_spaces, doc=doc, types=pf.Space)
+    finally:
+        profiler.set_active_profiler(None)
+
+    assert stats['walks'] == 3  # One for each action
+    assert stats['walk_seconds'] > 0
+    assert stats['replaced'] == 1
+    assert stats['deleted'] == 1
+    # The second walk only visits spaces, and there are none left
+    assert stats['visited'] == 2 * len(list(make_doc().iter()))
+    assert pf.stringify(doc).strip() == 'ab\n\nc'
+
+    # Nothing is counted when disabled
+    doc = pf.run_filters([emph_to_strong], doc=make_doc())
+    assert stats['walks'] == 3
+
+
+def test_get_profiler():
+    doc = make_doc()
+    os.environ.pop(profiler.ENVIRON, None)
+    assert profiler.get_profiler(doc).output is None
+    assert profiler.get_profiler(pf.Doc()) is None
+
+    try:
+        os.environ[profiler.ENVIRON] = '0'
+        assert profiler.get_profiler(doc) is None
+        os.environ[profiler.ENVIRON] = 'profile.json'
+        assert profiler.get_profiler(pf.Doc()).output == 'profile.json'
+    finally:
+        del os.environ[profiler.ENVIRON]
+
+
+def test_report(tmp_path):
+    prof = profiler.FilterProfiler(output=str(tmp_path / 'profile.json'))
+    prof.start_filter('a')
+    prof.add_walk(0.5)
+    prof.seconds['load'] = 0.25
+    prof.write()
+    with open(prof.output, encoding='utf-8') as f:
+        report = json.load(f)
+    assert report['seconds'] == {'load': 0.25}
+    assert report['filters'][0]['filter'] == 'a'
+    assert report['filters'][0]['walk_seconds'] == 0.5
+    assert report['filters'][0]['walks'] == 1
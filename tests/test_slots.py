@@ -0,0 +1,56 @@
+import sys
+import glob
+import struct
+import panflute as pf
+from panflute.base import _all_slots
+
+
+fns = sorted(glob.glob('./tests/[1-4]/api*/benchmark.json') +
+             glob.glob('./tests/input/*/benchmark.json'))
+
+
+def element_classes():
+    found = []
+    pending = [pf.Element]
+    while pending:
+        cls = pending.pop()
+        found.append(cls)
+        pending.extend(cls.__subclasses__())
+    return found
+
+
+def test_slot_layout():
+    pointer = struct.calcsize('P')
+    for cls in element_classes():
+        print('TESTING:', cls.__name__)
+        if cls is pf.Doc:
+            # Filters can add their own attributes to the document
+            assert '__dict__' in cls.__slots__
+            continue
+
+        # Every class declares its slots, without repeating inherited ones
+        for c in cls.__mro__[:-1]:
+            assert '__slots__' in c.__dict__, c
+        slots = _all_slots(cls)
+        assert len(slots) == len(set(slots))
+        assert cls.__basicsize__ == object.__basicsize__ + pointer * len(slots)
+
+
+def test_no_instance_dict():
+    overhead = set()
+    for fn in fns:
+        print('TESTING:', fn)
+        with open(fn, encoding='utf-8') as f:
+            doc = pf.load(f)
+        for elem in doc.iter():
+            if elem is doc:
+                continue
+            assert not hasattr(elem, '__dict__'), elem.tag
+            overhead.add(sys.getsizeof(elem) - type(elem).__basicsize__)
+    # The size of every element only depends on its slots
+    assert len(overhead) == 1
+
+
+if __name__ == "__main__":
+    test_slot_layout()
+    test_no_instance_dict()
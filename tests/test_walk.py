@@ -0,0 +1,126 @@
+import io
+import sys
+import glob
+import panflute as pf
+
+
+fns = sorted(glob.glob('./tests/[1-4]/api*/benchmark.json') +
+             glob.glob('./tests/input/*/benchmark.json'))
+
+
+def nested_divs(depth):
+    elem = pf.Para(pf.Str('deep'))
+    for i in range(depth):
+        elem = pf.Div(elem, pf.Para(pf.Str(str(i))))
+    return pf.Doc(elem)
+
+
+def nested_emphs(depth):
+    elem = pf.Str('deep')
+    for i in range(depth):
+        elem = pf.Emph(elem, pf.Space(), pf.Str(str(i)))
+    return pf.Doc(pf.Para(elem))
+
+
+def test_deep():
+    depth = sys.getrecursionlimit() * 2
+    for doc in (nested_divs(depth), nested_emphs(depth)):
+        seen = []
+        doc.walk(lambda elem, doc: seen.append(elem.tag))
+        assert seen[:2] == ['MetaMap', 'Str']
+        assert seen[-1] == 'Doc'
+        assert seen.count('Str') == depth + 1
+
+        def upper(elem, doc):
+            if isinstance(elem, pf.Str):
+                return pf.Str(elem.text.upper())
+
+        doc = doc.walk(upper)
+        seen = []
+        doc.walk(lambda elem, doc: seen.append(elem), types=pf.Str)
+        assert [e.text for e in seen[:2]] == ['DEEP', '0']
+
+        # Parents still point to the right elements
+        assert seen[0].parent.parent.parent is not None
+        assert seen[0].doc is doc
+
+
+def test_semantics():
+    def action(elem, doc):
+        if isinstance(elem, pf.Str) and elem.text == 'delete':
+            return []
+        elif isinstance(elem, pf.Str) and elem.text == 'splice':
+            return [pf.Str('a'), pf.Space(), pf.Str('b')]
+        elif isinstance(elem, pf.Emph):
+            return pf.Strong(*elem.content)
+        elif isinstance(elem, pf.Header):
+            return []
+        elif isinstance(elem, pf.Div):
+            return pf.BlockQuote()
+
+    doc = pf.Doc(
+        pf.Para(pf.Str('delete'), pf.Emph(pf.Str('splice')), pf.Str('x')),
+        pf.Header(pf.Str('gone')),
+        pf.Div(pf.Para(pf.Str('y'))),
+        metadata={'key': pf.MetaInlines(pf.Str('delete'), pf.Str('z'))})
+    para = doc.content[0]
+    containers = doc.content, para.content
+    doc = doc.walk(action)
+
+    assert len(doc.content) == 2
+    assert doc.content[0] is para  # Unchanged elements are kept
+    assert pf.stringify(para) == 'a bx\n\n'
+    assert isinstance(para.content[0], pf.Strong)
+    assert para.content[0].parent is para
+    assert isinstance(doc.content[1], pf.BlockQuote)
+    assert doc.get_metadata('key') == 'z'
+
+    # Altered lists are updated in place
+    assert doc.content is containers[0]
+    assert para.content is containers[1]
+
+    # New elements are still type-checked
+    try:
+        doc.walk(lambda elem, doc: pf.Para() if elem.tag == 'Str' else None)
+    except TypeError:
+        pass
+    else:
+        raise AssertionError('expected TypeError')
+
+    # Walking a list or dict container directly
+    ans = doc.content.walk(lambda elem, doc: None, doc)
+    assert ans == doc.content.list
+
+
+def test_iter():
+    for fn in fns:
+        print('TESTING:', fn)
+        with open(fn, encoding='utf-8') as f:
+            doc = pf.load(f)
+
+        walked = []
+        doc.walk(lambda elem, doc: walked.append(elem))
+        containers = [e.content for e in walked if e._children == ['content']]
+
+        # Same elements and order as walk()
+        assert list(doc.iter()) == walked
+        for types in (pf.Str, (pf.Para, pf.Link), pf.Block, pf.MetaValue):
+            expected = [e for e in walked if isinstance(e, types)]
+            assert list(doc.iter(types)) == expected
+            assert list(doc.find_all(types)) == expected
+            assert doc.find_first(types) is (expected[0] if expected else None)
+
+        # Nothing was rebuilt
+        assert all(a is b for a, b in zip(containers, [
+            e.content for e in walked if e._children == ['content']]))
+
+        links = list(doc.find_all(pf.Link, lambda e: e.url.startswith('http')))
+        assert all(e.url.startswith('http') for e in links)
+        assert all(e.parent is not None for e in links)
+        assert doc.find_first(pf.Str, lambda e: False) is None
+
+
+if __name__ == "__main__":
+    test_deep()
+    test_semantics()
+    test_iter()